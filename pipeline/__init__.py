@@ -0,0 +1,25 @@
+# pipeline/__init__.py
+
+import os
+import logging
+
+# Network layout is cosmetic; headless builds can skip it with STYROFOAM_LAYOUT=0
+LAYOUT_NODES = os.environ.get("STYROFOAM_LAYOUT", "1") == "1"
+
+
+class _FallbackHandler(logging.StreamHandler):
+    """
+    Print pipeline progress only while nothing has configured logging, as in an
+    interactive Houdini session. Once the CLI (or anything else) sets up root
+    handlers, records go there instead and this handler stays quiet.
+    """
+    def emit(self, record):
+        if not logging.getLogger().handlers:
+            super().emit(record)
+
+
+# Progress messages are INFO records; without this they would be dropped by
+# Python's last-resort handler, which only prints WARNING and above
+_log = logging.getLogger(__name__)
+_log.addHandler(_FallbackHandler())
+_log.setLevel(logging.INFO)
@@ -10,7 +10,8 @@ class AssetLocator(ABC):
     @abstractmethod
     def find_usds(self, assets_dir: str) -> List[str]:
         """
-        Scan the provided assets_dir and return a list of absolute paths to .usd files.
+        Scan the provided assets_dir and return a list of absolute paths to .usd files,
+        sorted lexicographically so callers need not re-sort it.
         """
         ...
 
@@ -20,14 +21,19 @@ class FilesystemLocator(AssetLocator):
     Filesystem-based implementation of AssetLocator.
     """
     def find_usds(self, assets_dir: str) -> List[str]:
-        # Ensure the directory exists
-        if not os.path.isdir(assets_dir):
+        # Collect and return sorted USD file paths from a single directory read;
+        # scandir entries carry their file type, so subdirectories are skipped
+        # without an extra stat per entry
+        try:
+            with os.scandir(assets_dir) as entries:
+                usd_files = [
+                    os.path.join(assets_dir, entry.name)
+                    for entry in entries
+                    if entry.name[-4:].lower() == ".usd" and entry.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
             raise NotADirectoryError(f"{assets_dir!r} is not a valid directory")
 
-        # Collect and return sorted USD file paths
-        usd_files = [
-            os.path.join(assets_dir, fn)
-            for fn in sorted(os.listdir(assets_dir))
-            if fn.lower().endswith(".usd")
-        ]
+        # Sort in place rather than copying through sorted()
+        usd_files.sort()
         return usd_files
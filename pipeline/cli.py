@@ -1,6 +1,7 @@
 # pipeline/cli.py
 
 import os
+import logging
 import argparse
 import subprocess
 from pathlib import Path
@@ -40,7 +41,14 @@ def main():
         "--clean-modified", action="store_true",
         help="Remove existing modified USD files before processing."
     )
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="Log per-material detail while building the Solaris network."
+    )
     args = parser.parse_args()
+    level = logging.DEBUG if args.verbose else logging.INFO
+    logging.basicConfig(level=level, format="%(message)s")
+    logging.getLogger("pipeline").setLevel(level)
 
     # --- Path Resolution ---
     assets_dir = Path(settings.assets_dir).resolve()
@@ -51,12 +59,17 @@ def main():
     # 1. Clean modified files if requested
     if args.clean_modified:
         print("Cleaning existing modified USD files...")
-        import glob
-        modified_files = glob.glob(str(assets_dir / "modified_*.usd"))
-        for modified_file in modified_files:
+        try:
+            with os.scandir(assets_dir) as it:
+                modified_files = [(e.name, e.path) for e in it
+                                  if e.name.startswith("modified_")
+                                  and e.name[-4:].lower() == ".usd" and e.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
+            raise NotADirectoryError(f"{str(assets_dir)!r} is not a valid directory")
+        for name, modified_file in modified_files:
             try:
                 os.remove(modified_file)
-                print(f"  Removed: {os.path.basename(modified_file)}")
+                print(f"  Removed: {name}")
             except Exception as e:
                 print(f"  Warning: Could not remove {modified_file}: {e}")
 
@@ -204,7 +217,7 @@ def main():
             print(f"Command: {' '.join(launch_cmd)}")
             print("\nThis will:")
             print("1. Launch Houdini GUI")
-            print("2. Load your HIP file automatically after 8 seconds") 
+            print("2. Load your HIP file automatically once the Houdini UI is idle")
             print("3. Set up TOPs scheduler and parameters")
             print("4. Execute TOPs workflow automatically")
             print("5. You may need to click 'Save and Continue' once if prompted")
@@ -3,12 +3,17 @@
 import os
 import re
 import json
+import logging
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
 import hou
 from pxr import Usd, Sdf, UsdGeom
 
+from pipeline import LAYOUT_NODES
+
+log = logging.getLogger(__name__)
+
 
 def extract_base_identifier_from_filename(filename: str) -> str:
     """
@@ -61,19 +66,19 @@ def _copy_prim_recursive(source_prim: Usd.Prim, target_parent_prim: Usd.Prim, ba
         # Handle Mesh_ prefixed primitives
         if original_name.startswith("Mesh_"):
             new_name = f"Mesh_{base_id}"
-            print(f"        Renaming child prim: '{original_name}' -> '{new_name}'")
+            log.debug("        Renaming child prim: '%s' -> '%s'", original_name, new_name)
         # Handle other patterns that might need renaming
         elif len(original_name) >= 6 and (original_name.startswith("B") or original_name.startswith("A")):
             # This looks like a product ID that should be replaced with our base_id
             new_name = base_id
-            print(f"        Renaming child prim: '{original_name}' -> '{new_name}'")
+            log.debug("        Renaming child prim: '%s' -> '%s'", original_name, new_name)
     
     new_path = target_parent_prim.GetPath().AppendChild(new_name)
     
     # Define the new prim in the target stage, preserving its type name
     new_prim = target_parent_prim.GetStage().DefinePrim(new_path, source_prim.GetTypeName())
     if not new_prim:
-        print(f"      Warning: Failed to define new prim at {new_path}. Skipping subtree copy for {source_prim.GetPath()}")
+        log.warning("      Failed to define new prim at %s. Skipping subtree copy for %s", new_path, source_prim.GetPath())
         return
 
     # Copy all authored attributes from the source prim to the new prim
@@ -94,7 +99,7 @@ def _copy_prim_recursive(source_prim: Usd.Prim, target_parent_prim: Usd.Prim, ba
                     source_primvar = source_geom_prim.GetPrimvar(UsdGeom.Tokens.normals)
                     if source_primvar and source_primvar.HasAuthoredInterpolation():
                         new_normals_attr.SetMetadata("interpolation", source_primvar.GetInterpolation())
-                    print(f"        Copied and explicitly set normals attribute: {attr_name}")
+                    log.debug("        Copied and explicitly set normals attribute: %s", attr_name)
                 elif attr_name.startswith("primvars:st"):
                     # Extract just "st" from "primvars:st" or "primvars:st0" etc.
                     primvar_base_name = attr_name.split(':', 1)[-1] 
@@ -104,19 +109,19 @@ def _copy_prim_recursive(source_prim: Usd.Prim, target_parent_prim: Usd.Prim, ba
                     source_primvar = source_geom_prim.GetPrimvar(attr_name)
                     if source_primvar and source_primvar.HasAuthoredInterpolation():
                         new_st_primvar.SetInterpolation(source_primvar.GetInterpolation())
-                    print(f"        Copied and explicitly set UV (st) primvar: {attr_name}")
+                    log.debug("        Copied and explicitly set UV (st) primvar: %s", attr_name)
                 else:
                     # Generic attribute copy for other attributes on a mesh prim
                     new_attr_generic = new_prim.CreateAttribute(attr_name, attr_type)
                     new_attr_generic.Set(attr.Get())
-                    print(f"        Copied general attribute on mesh: {attr_name} ({attr_type})")
+                    log.debug("        Copied general attribute on mesh: %s (%s)", attr_name, attr_type)
             else:
                 # Generic attribute copy for non-mesh prims
                 new_attr_generic = new_prim.CreateAttribute(attr_name, attr_type)
                 new_attr_generic.Set(attr.Get())
-                print(f"        Copied general attribute: {attr_name} ({attr_type})")
+                log.debug("        Copied general attribute: %s (%s)", attr_name, attr_type)
         else:
-            print(f"      Skipped unauthored attribute: {attr_name}")
+            log.debug("      Skipped unauthored attribute: %s", attr_name)
     
     # Copy all metadata from the source prim to the new prim
     for key, value in source_prim.GetAllMetadata().items():
@@ -163,11 +168,11 @@ def rename_usd_primitives(usd_path: str, base_id: str) -> str:
     
     # Check if modified file already exists and skip if it does
     if os.path.exists(modified_path):
-        print(f"  Modified USD file already exists: {modified_name}. Skipping modification.")
+        log.info("  Modified USD file already exists: %s. Skipping modification.", modified_name)
         return modified_path
     
-    print(f"  Preparing to modify USD file: {original_name} -> {modified_name}")
-    print(f"  Target base_id: {base_id}")
+    log.info("  Preparing to modify USD file: %s -> %s", original_name, modified_name)
+    log.debug("  Target base_id: %s", base_id)
     
     # Open the original USD file as the source stage
     source_stage = Usd.Stage.Open(usd_path)
@@ -198,7 +203,7 @@ def rename_usd_primitives(usd_path: str, base_id: str) -> str:
     
     # If no suitable prim containing mesh data was found, log a warning and return original path
     if not prim_to_rename_candidate:
-        print(f"  Warning: No suitable asset root prim containing mesh data found for renaming in {original_name}. Skipping renaming.")
+        log.warning("  No suitable asset root prim containing mesh data found for renaming in %s. Skipping renaming.", original_name)
         # If no modification is done, we might still want to return the original path for import
         return usd_path
 
@@ -213,8 +218,8 @@ def rename_usd_primitives(usd_path: str, base_id: str) -> str:
     if not new_asset_root_prim:
         raise RuntimeError(f"Failed to define new asset root prim at {new_asset_root_path} in new stage.")
 
-    print(f"    Copying and renaming asset root from '{source_asset_root_prim.GetPath()}' to '{new_asset_root_path}' in new file.")
-    print(f"    Using base_id '{base_id}' as the new prim name (ignoring source name '{source_asset_root_prim.GetName()}')")
+    log.debug("    Copying and renaming asset root from '%s' to '%s' in new file.", source_asset_root_prim.GetPath(), new_asset_root_path)
+    log.debug("    Using base_id '%s' as the new prim name (ignoring source name '%s')", base_id, source_asset_root_prim.GetName())
 
     # Copy all attributes, metadata, and relationships from the source asset root to the new asset root
     for attr in source_asset_root_prim.GetAttributes():
@@ -232,13 +237,13 @@ def rename_usd_primitives(usd_path: str, base_id: str) -> str:
 
     # Recursively copy all children (and their entire subtrees) from the source asset root
     # to be under the newly created asset root in the new stage.
-    print(f"    Recursively copying children from {source_asset_root_prim.GetPath()} to {new_asset_root_path}...")
+    log.debug("    Recursively copying children from %s to %s...", source_asset_root_prim.GetPath(), new_asset_root_path)
     for child in source_asset_root_prim.GetChildren():
         _copy_prim_recursive(child, new_asset_root_prim, base_id)
     
     # Save the newly created USD file
     new_stage.Save()
-    print(f"  Saved modified USD: {modified_path}")
+    log.info("  Saved modified USD: %s", modified_path)
     
     return modified_path
 
@@ -310,7 +315,7 @@ class HoudiniHipManager(HipManager):
             # Create unique filename if target already exists
             unique_hip_path = _create_unique_hip_filename(hip_path)
             if unique_hip_path != hip_path:
-                print(f"Target HIP file already exists. Saving as: {os.path.basename(unique_hip_path)}")
+                log.info("Target HIP file already exists. Saving as: %s", os.path.basename(unique_hip_path))
             hou.hipFile.save(unique_hip_path)
         else:
             hou.hipFile.save()
@@ -326,14 +331,14 @@ class HoudiniHipManager(HipManager):
         for usd_path in usd_paths:
             filename = os.path.basename(usd_path)
             if filename.startswith("modified_"):
-                print(f"Skipping modified USD file from input: {filename}")
+                log.info("Skipping modified USD file from input: %s", filename)
                 continue
             filtered_usd_paths.append(usd_path)
         
         usd_paths = filtered_usd_paths
         
         if not usd_paths:
-            print("Warning: No valid USD files to process after filtering.")
+            log.warning("No valid USD files to process after filtering.")
             return
 
         # 1) Grab /obj
@@ -356,23 +361,23 @@ class HoudiniHipManager(HipManager):
         processed_usd_paths = [] # To store paths of modified USD files
         for usd in usd_paths:
             if not os.path.isfile(usd):
-                print(f"Warning: USD file not found: {usd}. Skipping.")
+                log.warning("USD file not found: %s. Skipping.", usd)
                 continue
 
             filename = os.path.basename(usd)
             base_id = extract_base_identifier_from_filename(filename)
             usd_mapping[filename] = base_id
             
-            print(f"Processing USD: {filename}")
-            print(f"  Extracted base_id: {base_id}")
+            log.info("Processing USD: %s", filename)
+            log.debug("  Extracted base_id: %s", base_id)
             
             # Rename primitives in the USD file by creating a new, modified USD file
             modified_usd_path = rename_usd_primitives(usd, base_id)
             processed_usd_paths.append(modified_usd_path)
             
-            print(f"  Created modified USD: {os.path.basename(modified_usd_path)}")
-            print(f"  Should contain primitive named: {base_id}")
-            print("  " + "-"*50)
+            log.info("  Created modified USD: %s", os.path.basename(modified_usd_path))
+            log.debug("  Should contain primitive named: %s", base_id)
+            log.debug("  %s", "-" * 50)
             
         # Save the mapping to a JSON file in $HIP (useful for material assignment later)
         hip_dir = hou.expandString("$HIP")
@@ -380,8 +385,8 @@ class HoudiniHipManager(HipManager):
         with open(mapping_file, 'w') as f:
             json.dump(usd_mapping, f, indent=2)
         
-        print(f"Saved USD mapping to: {mapping_file}")
-        print(f"Mapping: {usd_mapping}")
+        log.info("Saved USD mapping to: %s", mapping_file)
+        log.debug("Mapping: %s", usd_mapping)
 
         # 4) USD Import SOP per processed USD file
         file_nodes = []
@@ -408,19 +413,16 @@ class HoudiniHipManager(HipManager):
                     f"available parms: {avail}"
                 )
 
-            usd_sop.moveToGoodPosition()
             file_nodes.append(usd_sop)
 
         # 5) Merge
         merge = container.createNode("merge", "merge_usds")
         for idx, fn in enumerate(file_nodes):
             merge.setInput(idx, fn)
-        merge.moveToGoodPosition()
 
         # 6) OUT null
         out_null = container.createNode("null", "OUT")
         out_null.setInput(0, merge)
-        out_null.moveToGoodPosition()
 
 
         # 11) Primitive Wrangle (NEW: added before z_to_y)
@@ -429,13 +431,10 @@ class HoudiniHipManager(HipManager):
         prim_wrangle.parm("class").set(1)  # Set to primitive mode
         prim_wrangle.parm("snippet").set("i@prim_amount = @primnum + 1;")
 
-        prim_wrangle.moveToGoodPosition()
-
         # 12) Rotate X -90 (Z-up → Y-up) - Now connects to primitive wrangle
         xform = container.createNode("xform", "z_to_y")
         xform.setInput(0, prim_wrangle)
         xform.parm("rx").set(-90)
-        xform.moveToGoodPosition()
 
         # 13) HDA (optional) - Now connects to z_to_y
         if hda_path:
@@ -448,21 +447,17 @@ class HoudiniHipManager(HipManager):
             hda_type = defs[0].nodeTypeName()
             hda_node = container.createNode(hda_type, "wrapped_assets")
             hda_node.setInput(0, xform)  # Connect to z_to_y instead of out_model
-            hda_node.moveToGoodPosition()
             
             # 14) Create output nulls for HDA outputs
             out_styrofoam = container.createNode("null", "OUT_STYROFOAM")
             out_styrofoam.setInput(0, hda_node, 0)  # Connect to first output
-            out_styrofoam.moveToGoodPosition()
             
             out_plastic = container.createNode("null", "OUT_PLASTIC") 
             out_plastic.setInput(0, hda_node, 1)  # Connect to second output
-            out_plastic.moveToGoodPosition()
             
             # NEW: Third output - OUT_MODEL connects to third HDA output
             out_model = container.createNode("null", "OUT_MODEL")
             out_model.setInput(0, hda_node, 2)  # Connect to third output
-            out_model.moveToGoodPosition()
             
             # Set display flag on one of the outputs
             out_styrofoam.setDisplayFlag(True)
@@ -471,8 +466,8 @@ class HoudiniHipManager(HipManager):
             # If no HDA, create OUT_MODEL and connect it to z_to_y
             out_model = container.createNode("null", "OUT_MODEL")
             out_model.setInput(0, xform)  # Connect to z_to_y
-            out_model.moveToGoodPosition()
             out_model.setDisplayFlag(True)
 
-        # 15) Layout
-        container.layoutChildren()
\ No newline at end of file
+        # 15) Layout - positions every SOP above in one pass, so nodes aren't placed individually
+        if LAYOUT_NODES:
+            container.layoutChildren()
\ No newline at end of file
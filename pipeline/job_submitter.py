@@ -1,16 +1,183 @@
 # pipeline/job_submitter.py
 
 import os
+import queue
 import shutil
+import asyncio
 import subprocess
 import tempfile
-from typing import Optional
+import time
+import atexit
+import weakref
+import logging
+import functools
+import threading
+from typing import IO, Callable, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Python scripts injected into TOPs jobs via HoudiniPythonScript. Paths are
+# substituted as repr() literals so quotes and backslashes in them survive.
+# The plugin info file is one key=value pair per line, so each rendered script
+# is wrapped as a single exec() of its repr(); joining the lines with "; "
+# would break the if/for blocks. They do not sleep between steps:
+# hipFile.load() and pressButton() both return once the work is done.
+_TOPS_WORKFLOW_SCRIPT = """\
+import hou
+print('Loading HIP file:', {hip_lit})
+hou.hipFile.load({hip_lit})
+hda_node = hou.node({hda_lit})
+if hda_node is None:
+    raise RuntimeError('HDA node not found: ' + {hda_lit})
+print(f'HDA node found: {{hda_node.name()}} ({{hda_node.type().name()}})')
+if not hda_node.parm('dirtybutton'):
+    raise RuntimeError('dirtybutton parameter not found on HDA')
+if not hda_node.parm('cookbutton'):
+    raise RuntimeError('cookbutton parameter not found on HDA')
+print('Found required TOPs control parameters')
+print('Dirtying TOPs network...')
+hda_node.parm('dirtybutton').pressButton()
+print('Cooking TOPs network...')
+hda_node.parm('cookbutton').pressButton()
+print('TOPs workflow execution initiated successfully')
+print('TOPs workflow is now running - monitor progress in Houdini')"""
+
+_TOPS_SCHEDULER_SCRIPT = """\
+import hou
+print('Loading HIP file:', {hip_lit})
+hou.hipFile.load({hip_lit})
+hda_node = hou.node({hda_lit})
+if hda_node is None:
+    raise RuntimeError('HDA node not found: ' + {hda_lit})
+print(f'HDA node found: {{hda_node.name()}} ({{hda_node.type().name()}})')
+if hda_node.parm('topscheduler'):
+    current_scheduler = hda_node.parm('topscheduler').eval()
+    print(f'Current scheduler: {{current_scheduler}}')
+    hda_node.parm('topscheduler').set({scheduler_lit})
+    new_scheduler = hda_node.parm('topscheduler').eval()
+    print(f'Set scheduler to: {{new_scheduler}}')
+else:
+    print('Warning: topscheduler parameter not found, using default scheduler')
+if not hda_node.parm('dirtybutton'):
+    raise RuntimeError('dirtybutton parameter not found on HDA')
+if not hda_node.parm('cookbutton'):
+    raise RuntimeError('cookbutton parameter not found on HDA')
+print('Found required TOPs control parameters')
+print('Dirtying TOPs network...')
+hda_node.parm('dirtybutton').pressButton()
+print('Cooking TOPs network...')
+hda_node.parm('cookbutton').pressButton()
+print('TOPs workflow execution initiated with ' + {scheduler_type_lit} + ' scheduler')
+print('TOPs workflow is now running - check scheduler for task distribution')"""
+
+_TOPS_STATUS_SCRIPT = """\
+import hou
+print('Loading HIP file:', {hip_lit})
+hou.hipFile.load({hip_lit})
+hda_node = hou.node({hda_lit})
+if hda_node is None:
+    raise RuntimeError('HDA node not found: ' + {hda_lit})
+print(f'HDA node found: {{hda_node.name()}}')
+if hda_node.parm('topscheduler'):
+    scheduler = hda_node.parm('topscheduler').eval()
+    print(f'Current TOPs scheduler: {{scheduler}}')
+else:
+    print('No topscheduler parameter found')
+for parm_name in ['cookbutton', 'dirtybutton', 'cancelbutton']:
+    if hda_node.parm(parm_name):
+        print(f'Parameter {{parm_name}} is available')
+    else:
+        print(f'Parameter {{parm_name}} is NOT available')
+print('TOPs status check completed')"""
+
+
+def _render_script(template: str, **fields) -> bytes:
+    return f"exec({template.format(**fields)!r})".encode()
+
+
+# Retries and status polling resubmit identical arguments, so the rendered
+# scripts are memoized per argument tuple.
+@functools.lru_cache(maxsize=256)
+def _build_workflow_script(hip_path: str, hda_node_path: str) -> bytes:
+    return _render_script(
+        _TOPS_WORKFLOW_SCRIPT,
+        hip_lit=repr(hip_path),
+        hda_lit=repr(hda_node_path),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _build_scheduler_script(hip_path: str, hda_node_path: str, scheduler_path: str, scheduler_type: str) -> bytes:
+    return _render_script(
+        _TOPS_SCHEDULER_SCRIPT,
+        hip_lit=repr(hip_path),
+        hda_lit=repr(hda_node_path),
+        scheduler_lit=repr(scheduler_path),
+        scheduler_type_lit=repr(scheduler_type),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _build_status_script(hip_path: str, hda_node_path: str) -> bytes:
+    return _render_script(
+        _TOPS_STATUS_SCRIPT,
+        hip_lit=repr(hip_path),
+        hda_lit=repr(hda_node_path),
+    )
+
+
+def _parse_job_id(stdout: str) -> str:
+    """Return the JobID from deadlinecommand output, or the whole output if there is none."""
+    for line in stdout.splitlines():
+        if line.startswith("JobID="):
+            return line[len("JobID="):].strip()
+    return stdout.strip()
+
 
 class DeadlineSubmissionError(Exception):
     pass
 
 class DeadlineSubmitter:
-    def __init__(self, deadline_command: Optional[str] = None):
+    # Constant job/plugin info lines, encoded once instead of per submission.
+    _PLUGIN_HOUDINI = b"Plugin=Houdini"
+    _FRAMES_SINGLE = b"Frames=1"
+    _IGNORE_INPUTS = b"HoudiniIgnoreInputs=True"
+    _COMMENT_SIM = b"Comment=Automated simulation"
+    _COMMENT_RENDER = b"Comment=Automated render"
+    _COMMENT_TOPS = b"Comment=Automated TOPs workflow execution"
+    _COMMENT_STATUS = b"Comment=TOPs workflow status check"
+
+    # Persistent mode: every request is followed by an Echo of this token, and its
+    # reply is read up to the echoed line, so output a request prints after its
+    # JobID is never mistaken for the next request's reply.
+    _REPLY_SENTINEL = b"StyrofoamWrap-end-of-reply"
+
+    # Threads still draining/reaping deadlinecommand after its JobID was returned
+    _reapers: list[threading.Thread] = []
+    _reapers_lock = threading.Lock()
+    # Seconds _join_reapers() waits at interpreter exit before leaving the
+    # (daemon) reaper threads behind, so a hung deadlinecommand can't block exit
+    _REAPER_JOIN_TIMEOUT = 10.0
+
+    def __init__(self, deadline_command: Optional[str] = None, persistent: bool = False,
+                 persistent_timeout: float = 120.0):
+        """
+        Args:
+            deadline_command: Path to deadlinecommand; falls back to PATH lookup
+            persistent: Keep one `deadlinecommand -Persistent` process alive and send
+                every blocking submission over its stdin instead of exec'ing per job
+            persistent_timeout: Seconds to wait for a persistent-mode reply before the
+                process is killed and the submission fails
+        """
+        self.persistent = persistent
+        self.persistent_timeout = persistent_timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._proc_lines: Optional[queue.Queue] = None
+        # Stops the current persistent process at exit or when the submitter is
+        # collected; holds no reference to self, so it doesn't keep it alive
+        self._proc_finalizer: Optional[weakref.finalize] = None
+        self._proc_lock = threading.Lock()
+
         # 1) Use explicit setting if given
         if deadline_command and os.path.isfile(deadline_command):
             self.deadline_command = deadline_command
@@ -25,138 +192,312 @@ class DeadlineSubmitter:
                     "Either install the Deadline Client or set DEADLINE_COMMAND to the full path."
                 )
 
-    def _submit(self, job_info: list[str], plugin_info: list[str]) -> str:
-        ji = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt")
-        ji.write("\n".join(job_info)); ji.close()
-        pi = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt")
-        pi.write("\n".join(plugin_info)); pi.close()
+    def _write_job_files(self, job_info: list[bytes], plugin_info: list[bytes]) -> Tuple[str, str]:
+        ji = tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt")
+        ji.write(b"\n".join(job_info)); ji.close()
+        pi = tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt")
+        pi.write(b"\n".join(plugin_info)); pi.close()
+        return ji.name, pi.name
 
-        result = subprocess.run(
-            [self.deadline_command, ji.name, pi.name],
-            capture_output=True, text=True
-        )
-        os.remove(ji.name); os.remove(pi.name)
+    def _spawn(self, args: list[str], stderr_file) -> Tuple[IO[str], Callable[[], int]]:
+        """
+        Start deadlinecommand with stdout on a pipe and stderr in stderr_file.
 
-        if result.returncode != 0:
-            raise DeadlineSubmissionError(result.stderr.strip())
-        return result.stdout.strip()
+        Where available, os.posix_spawn is used so the child is started without
+        fork() duplicating the page tables of a large Houdini/USD parent process.
 
-    def submit_simulation(self, hip_path: str, frame_range: str, output_driver: str, name: Optional[str]=None) -> str:
+        Returns:
+            (stdout, wait) - a line-buffered text reader over the child's stdout and
+            a callable that blocks until the child exits and returns its exit code.
+        """
+        if not hasattr(os, "posix_spawn"):
+            proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr_file,
+                                    bufsize=1, text=True, errors="replace")
+            return proc.stdout, proc.wait
+
+        read_fd, write_fd = os.pipe()
+        try:
+            pid = os.posix_spawn(args[0], args, os.environ, file_actions=[
+                (os.POSIX_SPAWN_DUP2, write_fd, 1),
+                (os.POSIX_SPAWN_DUP2, stderr_file.fileno(), 2),
+            ])
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            # Only the child keeps the write end, so we see EOF when it exits
+            os.close(write_fd)
+
+        def wait() -> int:
+            _, status = os.waitpid(pid, 0)
+            return os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+
+        return os.fdopen(read_fd, "r", errors="replace"), wait
+
+    @classmethod
+    def _reap_in_background(cls, stdout: IO[str], wait: Callable[[], int], stderr_file: IO[bytes],
+                            paths: Tuple[str, ...]):
+        """
+        Let deadlinecommand finish its trailing logging after the JobID was read.
+
+        stdout is drained so the child never blocks (or dies of SIGPIPE) on a full
+        pipe, then the child is reaped and the job files removed. The job was
+        already accepted, so a non-zero exit is logged as a warning with the
+        child's stderr rather than raised. The thread is tracked so
+        _join_reapers() can wait for it at interpreter exit.
+        """
+        def reap():
+            with stdout:
+                for _ in stdout:
+                    pass
+            returncode = wait()
+            with stderr_file:
+                if returncode != 0:
+                    stderr_file.seek(0)
+                    log.warning("deadlinecommand exited with code %d after printing its JobID: %s",
+                                returncode, stderr_file.read().decode(errors="replace").strip())
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        thread = threading.Thread(target=reap, name="deadlinecommand-reaper", daemon=True)
+        thread.start()
+        with cls._reapers_lock:
+            cls._reapers = [t for t in cls._reapers if t.is_alive()]
+            cls._reapers.append(thread)
+
+    @classmethod
+    def _join_reapers(cls, timeout: Optional[float] = None):
+        """Wait up to timeout seconds in total (default _REAPER_JOIN_TIMEOUT) for the reaper threads."""
+        with cls._reapers_lock:
+            reapers, cls._reapers = cls._reapers, []
+        deadline = time.monotonic() + (cls._REAPER_JOIN_TIMEOUT if timeout is None else timeout)
+        for thread in reapers:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _persistent_process(self) -> subprocess.Popen:
+        """Start (or restart) the shared `deadlinecommand -Persistent` process. Caller holds _proc_lock."""
+        if self._proc is None or self._proc.poll() is not None:
+            self._reset_persistent()  # Retire a process that exited on its own
+            self._proc = subprocess.Popen(
+                [self.deadline_command, "-Persistent"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0
+            )
+            # A reader thread feeds stdout lines into a queue so replies can be read
+            # with a timeout; None marks EOF
+            self._proc_lines = queue.Queue()
+            threading.Thread(target=self._pump_lines, args=(self._proc.stdout, self._proc_lines),
+                             name="deadlinecommand-persistent-reader", daemon=True).start()
+            # Only one finalizer is live at a time: the previous process's one
+            # ran when that process was reset above
+            self._proc_finalizer = weakref.finalize(self, self._stop, self._proc)
+        return self._proc
+
+    @staticmethod
+    def _pump_lines(stdout: IO[bytes], lines: queue.Queue):
+        try:
+            for raw in iter(stdout.readline, b""):
+                lines.put(raw.decode(errors="replace"))
+        except (OSError, ValueError):
+            pass  # stdout was closed by _stop() while a read was pending
+        lines.put(None)
+
+    def _reset_persistent(self):
+        """Kill the persistent process so the next submission starts a fresh one. Caller holds _proc_lock."""
+        self._proc = None
+        finalizer, self._proc_finalizer = self._proc_finalizer, None
+        if finalizer is not None:
+            finalizer()
+
+    def _submit_persistent(self, ji_path: str, pi_path: str) -> str:
+        """
+        Hand a job/plugin file pair to the persistent deadlinecommand and read back its JobID.
+
+        Persistent mode serves one request at a time, so the write and the reply read
+        happen under a lock. The reply is everything up to the echoed sentinel; if it
+        does not arrive within persistent_timeout the process is killed and reset.
+        """
+        sentinel = self._REPLY_SENTINEL.decode()
+        with self._proc_lock:
+            proc = self._persistent_process()
+            lines_in = self._proc_lines
+            try:
+                proc.stdin.write(b"SubmitJob\n" + ji_path.encode() + b"\n" + pi_path.encode() + b"\n"
+                                 + b"Echo\n" + self._REPLY_SENTINEL + b"\n")
+                proc.stdin.flush()
+            except OSError:
+                self._reset_persistent()
+                raise DeadlineSubmissionError("deadlinecommand -Persistent is not accepting requests")
+
+            lines = []
+            deadline = time.monotonic() + self.persistent_timeout
+            while True:
+                try:
+                    line = lines_in.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._reset_persistent()
+                    raise DeadlineSubmissionError(
+                        f"No reply from deadlinecommand -Persistent within {self.persistent_timeout:g}s: "
+                        + "".join(lines).strip()
+                    )
+                if line is None:
+                    # EOF: the process died mid-request; the next submission starts a fresh one
+                    self._reset_persistent()
+                    raise DeadlineSubmissionError("".join(lines).strip() or "deadlinecommand -Persistent exited")
+                if line.strip() == sentinel:
+                    break
+                lines.append(line)
+
+            output = "".join(lines)
+            if not any(line.startswith("JobID=") for line in lines):
+                raise DeadlineSubmissionError(output.strip() or "deadlinecommand returned no JobID")
+            return _parse_job_id(output)
+
+    @staticmethod
+    def _stop(proc: subprocess.Popen):
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdin.close(); proc.stdout.close()
+
+    def close(self):
+        """Stop the persistent deadlinecommand process, if one is running."""
+        with self._proc_lock:
+            self._reset_persistent()
+
+    def _submit(self, job_info: list[bytes], plugin_info: list[bytes]) -> str:
+        """
+        Submit a job and return its JobID as soon as deadlinecommand prints it.
+
+        Deadline keeps logging for a while after the JobID line, so the rest of
+        its output and its exit are handled by a reaper thread; a printed JobID
+        means the job was accepted, and a later non-zero exit is only logged. If
+        stdout ends without a JobID line, this waits for the exit code, raises
+        DeadlineSubmissionError with stderr if it is non-zero, and otherwise
+        returns the full stdout.
+        """
+        ji_path, pi_path = self._write_job_files(job_info, plugin_info)
+        if self.persistent:
+            try:
+                return self._submit_persistent(ji_path, pi_path)
+            finally:
+                os.remove(ji_path); os.remove(pi_path)
+
+        reaped = False
+        err = tempfile.TemporaryFile()
+        try:
+            stdout, wait = self._spawn([self.deadline_command, ji_path, pi_path], err)
+            lines = []
+            for line in stdout:
+                if line.startswith("JobID="):
+                    # The reaper takes over stdout, stderr and the job files
+                    self._reap_in_background(stdout, wait, err, (ji_path, pi_path))
+                    reaped = True
+                    return _parse_job_id(line)
+                lines.append(line)
+            stdout.close()
+            returncode = wait()
+            err.seek(0)
+            stderr = err.read().decode(errors="replace")
+        finally:
+            if not reaped:
+                err.close()
+                os.remove(ji_path); os.remove(pi_path)
+
+        if returncode != 0:
+            raise DeadlineSubmissionError(stderr.strip())
+        return "".join(lines).strip()
+
+    async def _submit_async(self, job_info: list[bytes], plugin_info: list[bytes]) -> str:
+        """
+        Non-blocking counterpart of _submit. Awaiting several of these from one
+        event loop keeps multiple deadlinecommand submissions in flight at once.
+        """
+        ji_path, pi_path = self._write_job_files(job_info, plugin_info)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                self.deadline_command, ji_path, pi_path,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            out, err = await proc.communicate()
+        finally:
+            os.remove(ji_path); os.remove(pi_path)
+
+        if proc.returncode != 0:
+            raise DeadlineSubmissionError(err.decode(errors="replace").strip())
+        return _parse_job_id(out.decode(errors="replace"))
+
+    def _simulation_job(self, hip_path: str, frame_range: str, output_driver: str, name: Optional[str]=None) -> Tuple[list[bytes], list[bytes]]:
         job_name = name or f"Sim_{os.path.basename(hip_path)}"
         ji = [
-            "Plugin=Houdini",
-            f"Name={job_name}",
-            f"Frames={frame_range}",
-            "Comment=Automated simulation",
+            self._PLUGIN_HOUDINI,
+            b"Name=" + job_name.encode(),
+            b"Frames=" + str(frame_range).encode(),
+            self._COMMENT_SIM,
         ]
         pi = [
-            f"HoudiniHipFile={hip_path}",
-            f"HoudiniOutputDriver={output_driver}",
+            b"HoudiniHipFile=" + hip_path.encode(),
+            b"HoudiniOutputDriver=" + output_driver.encode(),
         ]
-        return self._submit(ji, pi)
+        return ji, pi
 
-    def submit_render(self, hip_path: str, frame_range: str, output_driver: str, depends_on: str, name: Optional[str]=None) -> str:
+    def _render_job(self, hip_path: str, frame_range: str, output_driver: str, depends_on: str, name: Optional[str]=None) -> Tuple[list[bytes], list[bytes]]:
         job_name = name or f"Render_{os.path.basename(hip_path)}"
         ji = [
-            "Plugin=Houdini",
-            f"Name={job_name}",
-            f"Frames={frame_range}",
-            f"DependsOnJobID={depends_on}",
-            "Comment=Automated render",
+            self._PLUGIN_HOUDINI,
+            b"Name=" + job_name.encode(),
+            b"Frames=" + str(frame_range).encode(),
+            b"DependsOnJobID=" + depends_on.encode(),
+            self._COMMENT_RENDER,
         ]
         pi = [
-            f"HoudiniHipFile={hip_path}",
-            f"HoudiniOutputDriver={output_driver}",
+            b"HoudiniHipFile=" + hip_path.encode(),
+            b"HoudiniOutputDriver=" + output_driver.encode(),
         ]
-        return self._submit(ji, pi)
+        return ji, pi
     
-    def submit_tops_workflow(self, hip_path: str, hda_node_path: str, name: Optional[str] = None, depends_on: Optional[str] = None) -> str:
-        """
-        Submit a TOPs workflow job that will dirty and cook the TOPs network in the specified HDA node.
-        
-        Args:
-            hip_path: Path to the Houdini .hip file
-            hda_node_path: Path to the HDA node containing the TOPs network (e.g., "/obj/assets/wrapped_assets")
-            name: Optional custom job name
-            depends_on: Optional job ID this job should depend on
-        """
+    def _tops_workflow_job(self, hip_path: str, hda_node_path: str, name: Optional[str] = None, depends_on: Optional[str] = None) -> Tuple[list[bytes], list[bytes]]:
         job_name = name or f"TOPs_{os.path.basename(hip_path)}"
         
         # Job info
         ji = [
-            "Plugin=Houdini",
-            f"Name={job_name}",
-            "Frames=1",  # TOPs workflows typically run on a single frame
-            "Comment=Automated TOPs workflow execution",
+            self._PLUGIN_HOUDINI,
+            b"Name=" + job_name.encode(),
+            self._FRAMES_SINGLE,  # TOPs workflows typically run on a single frame
+            self._COMMENT_TOPS,
         ]
         
         # Add dependency if specified
         if depends_on:
-            ji.append(f"DependsOnJobID={depends_on}")
+            ji.append(b"DependsOnJobID=" + depends_on.encode())
         
         # Plugin info - we'll use a Python script to execute the TOPs workflow
-        # This script will load the file, wait for initialization, then execute TOPs
-        script_commands = [
-            f"import hou",
-            f"import time",
-            f"print('Loading HIP file: {hip_path}')",
-            f"hou.hipFile.load('{hip_path}')",
-            f"print('Waiting for scene to initialize...')",
-            f"time.sleep(5)",  # Increased wait time for initialization
-            f"hda_node = hou.node('{hda_node_path}')",
-            f"if hda_node is None:",
-            f"    raise RuntimeError('HDA node not found: {hda_node_path}')",
-            f"print(f'HDA node found: {{hda_node.name()}} ({{hda_node.type().name()}})')",
-            f"# Validate required parameters exist",
-            f"if not hda_node.parm('dirtybutton'):",
-            f"    raise RuntimeError('dirtybutton parameter not found on HDA')",
-            f"if not hda_node.parm('cookbutton'):",
-            f"    raise RuntimeError('cookbutton parameter not found on HDA')",
-            f"print('Found required TOPs control parameters')",
-            f"print('Dirtying TOPs network...')",
-            f"hda_node.parm('dirtybutton').pressButton()",
-            f"time.sleep(3)",  # Wait for dirty operation to complete
-            f"print('Cooking TOPs network...')",
-            f"hda_node.parm('cookbutton').pressButton()",
-            f"print('TOPs workflow execution initiated successfully')",
-            f"time.sleep(2)",
-            f"print('TOPs workflow is now running - monitor progress in Houdini')"
-        ]
-        
-        # Join script commands with semicolons for single-line execution
-        python_script = "; ".join(script_commands)
+        # This script will load the file, then dirty and cook TOPs
+        python_script = _build_workflow_script(hip_path, hda_node_path)
         
         pi = [
-            f"HoudiniHipFile={hip_path}",
-            f"HoudiniIgnoreInputs=True",
-            f"HoudiniPythonScript={python_script}",
+            b"HoudiniHipFile=" + hip_path.encode(),
+            self._IGNORE_INPUTS,
+            b"HoudiniPythonScript=" + python_script,
         ]
         
-        return self._submit(ji, pi)
+        return ji, pi
     
-    def submit_tops_with_scheduler(self, hip_path: str, hda_node_path: str, scheduler_type: str = "deadline", 
-                                 name: Optional[str] = None, depends_on: Optional[str] = None) -> str:
-        """
-        Submit a TOPs workflow job with a specific scheduler (like Deadline scheduler).
-        
-        Args:
-            hip_path: Path to the Houdini .hip file
-            hda_node_path: Path to the HDA node containing the TOPs network
-            scheduler_type: Type of scheduler to use ("deadline", "localscheduler", etc.)
-            name: Optional custom job name
-            depends_on: Optional job ID this job should depend on
-        """
+    def _tops_with_scheduler_job(self, hip_path: str, hda_node_path: str, scheduler_type: str = "deadline", 
+                                 name: Optional[str] = None, depends_on: Optional[str] = None) -> Tuple[list[bytes], list[bytes]]:
         job_name = name or f"TOPs_{scheduler_type}_{os.path.basename(hip_path)}"
         
         ji = [
-            "Plugin=Houdini",
-            f"Name={job_name}",
-            "Frames=1",
-            f"Comment=TOPs workflow with {scheduler_type} scheduler",
+            self._PLUGIN_HOUDINI,
+            b"Name=" + job_name.encode(),
+            self._FRAMES_SINGLE,
+            f"Comment=TOPs workflow with {scheduler_type} scheduler".encode(),
         ]
         
         if depends_on:
-            ji.append(f"DependsOnJobID={depends_on}")
+            ji.append(b"DependsOnJobID=" + depends_on.encode())
         
         # Build the scheduler path based on the type
         if scheduler_type == "deadline":
@@ -168,52 +509,80 @@ class DeadlineSubmitter:
             scheduler_path = f"/tasks/topnet1/{scheduler_type}"
         
         # More sophisticated script that can configure the scheduler
-        script_commands = [
-            f"import hou",
-            f"import time",
-            f"print('Loading HIP file: {hip_path}')",
-            f"hou.hipFile.load('{hip_path}')",
-            f"print('Waiting for scene to initialize...')",
-            f"time.sleep(5)",  # Increased wait time
-            f"hda_node = hou.node('{hda_node_path}')",
-            f"if hda_node is None:",
-            f"    raise RuntimeError('HDA node not found: {hda_node_path}')",
-            f"print(f'HDA node found: {{hda_node.name()}} ({{hda_node.type().name()}})')",
-            f"# Configure the scheduler if topscheduler parameter exists",
-            f"if hda_node.parm('topscheduler'):",
-            f"    current_scheduler = hda_node.parm('topscheduler').eval()",
-            f"    print(f'Current scheduler: {{current_scheduler}}')",
-            f"    hda_node.parm('topscheduler').set('{scheduler_path}')",
-            f"    new_scheduler = hda_node.parm('topscheduler').eval()",
-            f"    print(f'Set scheduler to: {{new_scheduler}}')",
-            f"    time.sleep(2)",  # Allow parameter change to take effect
-            f"else:",
-            f"    print('Warning: topscheduler parameter not found, using default scheduler')",
-            f"# Validate required parameters exist",
-            f"if not hda_node.parm('dirtybutton'):",
-            f"    raise RuntimeError('dirtybutton parameter not found on HDA')",
-            f"if not hda_node.parm('cookbutton'):",
-            f"    raise RuntimeError('cookbutton parameter not found on HDA')",
-            f"print('Found required TOPs control parameters')",
-            f"print('Dirtying TOPs network...')",
-            f"hda_node.parm('dirtybutton').pressButton()",
-            f"time.sleep(3)",  # Wait for dirty operation
-            f"print('Cooking TOPs network...')",
-            f"hda_node.parm('cookbutton').pressButton()",
-            f"print(f'TOPs workflow execution initiated with {{scheduler_type}} scheduler')",
-            f"time.sleep(2)",
-            f"print('TOPs workflow is now running - check scheduler for task distribution')"
+        python_script = _build_scheduler_script(hip_path, hda_node_path, scheduler_path, scheduler_type)
+        
+        pi = [
+            b"HoudiniHipFile=" + hip_path.encode(),
+            self._IGNORE_INPUTS,
+            b"HoudiniPythonScript=" + python_script,
         ]
         
-        python_script = "; ".join(script_commands)
+        return ji, pi
+    
+    def _tops_status_job(self, hip_path: str, hda_node_path: str, name: Optional[str] = None) -> Tuple[list[bytes], list[bytes]]:
+        job_name = name or f"TOPs_Status_{os.path.basename(hip_path)}"
+        
+        ji = [
+            self._PLUGIN_HOUDINI,
+            b"Name=" + job_name.encode(),
+            self._FRAMES_SINGLE,
+            self._COMMENT_STATUS,
+        ]
+        
+        # Script to check TOPs status
+        python_script = _build_status_script(hip_path, hda_node_path)
         
         pi = [
-            f"HoudiniHipFile={hip_path}",
-            f"HoudiniIgnoreInputs=True", 
-            f"HoudiniPythonScript={python_script}",
+            b"HoudiniHipFile=" + hip_path.encode(),
+            self._IGNORE_INPUTS,
+            b"HoudiniPythonScript=" + python_script,
         ]
         
-        return self._submit(ji, pi)
+        return ji, pi
+
+    # --- Public submission API (blocking) ---
+    # Each call returns the Deadline JobID as soon as deadlinecommand prints it
+    # (see _submit), or its full output if it printed none and exited cleanly.
+
+    def submit_simulation(self, hip_path: str, frame_range: str, output_driver: str, name: Optional[str]=None) -> str:
+        """Submit a simulation job and return its JobID."""
+        return self._submit(*self._simulation_job(hip_path, frame_range, output_driver, name))
+
+    def submit_render(self, hip_path: str, frame_range: str, output_driver: str, depends_on: str, name: Optional[str]=None) -> str:
+        """Submit a render job that waits on depends_on and return its JobID."""
+        return self._submit(*self._render_job(hip_path, frame_range, output_driver, depends_on, name))
+
+    def submit_tops_workflow(self, hip_path: str, hda_node_path: str, name: Optional[str] = None, depends_on: Optional[str] = None) -> str:
+        """
+        Submit a TOPs workflow job that will dirty and cook the TOPs network in the specified HDA node.
+        
+        Args:
+            hip_path: Path to the Houdini .hip file
+            hda_node_path: Path to the HDA node containing the TOPs network (e.g., "/obj/assets/wrapped_assets")
+            name: Optional custom job name
+            depends_on: Optional job ID this job should depend on
+
+        Returns:
+            The JobID of the submitted job
+        """
+        return self._submit(*self._tops_workflow_job(hip_path, hda_node_path, name, depends_on))
+    
+    def submit_tops_with_scheduler(self, hip_path: str, hda_node_path: str, scheduler_type: str = "deadline", 
+                                 name: Optional[str] = None, depends_on: Optional[str] = None) -> str:
+        """
+        Submit a TOPs workflow job with a specific scheduler (like Deadline scheduler).
+        
+        Args:
+            hip_path: Path to the Houdini .hip file
+            hda_node_path: Path to the HDA node containing the TOPs network
+            scheduler_type: Type of scheduler to use ("deadline", "localscheduler", etc.)
+            name: Optional custom job name
+            depends_on: Optional job ID this job should depend on
+
+        Returns:
+            The JobID of the submitted job
+        """
+        return self._submit(*self._tops_with_scheduler_job(hip_path, hda_node_path, scheduler_type, name, depends_on))
     
     def submit_tops_local_execution(self, hip_path: str, hda_node_path: str, name: Optional[str] = None) -> str:
         """
@@ -224,6 +593,9 @@ class DeadlineSubmitter:
             hip_path: Path to the Houdini .hip file
             hda_node_path: Path to the HDA node containing the TOPs network
             name: Optional custom job name
+
+        Returns:
+            The JobID of the submitted job
         """
         return self.submit_tops_with_scheduler(
             hip_path=hip_path,
@@ -240,48 +612,39 @@ class DeadlineSubmitter:
             hip_path: Path to the Houdini .hip file
             hda_node_path: Path to the HDA node containing the TOPs network
             name: Optional custom job name
+
+        Returns:
+            The JobID of the submitted job
         """
-        job_name = name or f"TOPs_Status_{os.path.basename(hip_path)}"
-        
-        ji = [
-            "Plugin=Houdini",
-            f"Name={job_name}",
-            "Frames=1",
-            "Comment=TOPs workflow status check",
-        ]
-        
-        # Script to check TOPs status
-        script_commands = [
-            f"import hou",
-            f"import time",
-            f"print('Loading HIP file: {hip_path}')",
-            f"hou.hipFile.load('{hip_path}')",
-            f"time.sleep(3)",
-            f"hda_node = hou.node('{hda_node_path}')",
-            f"if hda_node is None:",
-            f"    raise RuntimeError('HDA node not found: {hda_node_path}')",
-            f"print(f'HDA node found: {{hda_node.name()}}')",
-            f"# Check if TOPs network exists and get status",
-            f"if hda_node.parm('topscheduler'):",
-            f"    scheduler = hda_node.parm('topscheduler').eval()",
-            f"    print(f'Current TOPs scheduler: {{scheduler}}')",
-            f"else:",
-            f"    print('No topscheduler parameter found')",
-            f"# Check other relevant parameters",
-            f"for parm_name in ['cookbutton', 'dirtybutton', 'cancelbutton']:",
-            f"    if hda_node.parm(parm_name):",
-            f"        print(f'Parameter {{parm_name}} is available')",
-            f"    else:",
-            f"        print(f'Parameter {{parm_name}} is NOT available')",
-            f"print('TOPs status check completed')"
-        ]
-        
-        python_script = "; ".join(script_commands)
-        
-        pi = [
-            f"HoudiniHipFile={hip_path}",
-            f"HoudiniIgnoreInputs=True",
-            f"HoudiniPythonScript={python_script}",
-        ]
-        
-        return self._submit(ji, pi)
\ No newline at end of file
+        return self._submit(*self._tops_status_job(hip_path, hda_node_path, name))
+
+    # --- Public submission API (asyncio) ---
+    # Same jobs as above, but awaitable so an async pipeline can keep many
+    # submissions in flight from a single event-loop thread.
+
+    async def submit_simulation_async(self, hip_path: str, frame_range: str, output_driver: str, name: Optional[str]=None) -> str:
+        return await self._submit_async(*self._simulation_job(hip_path, frame_range, output_driver, name))
+
+    async def submit_render_async(self, hip_path: str, frame_range: str, output_driver: str, depends_on: str, name: Optional[str]=None) -> str:
+        return await self._submit_async(*self._render_job(hip_path, frame_range, output_driver, depends_on, name))
+
+    async def submit_tops_workflow_async(self, hip_path: str, hda_node_path: str, name: Optional[str] = None, depends_on: Optional[str] = None) -> str:
+        return await self._submit_async(*self._tops_workflow_job(hip_path, hda_node_path, name, depends_on))
+
+    async def submit_tops_with_scheduler_async(self, hip_path: str, hda_node_path: str, scheduler_type: str = "deadline",
+                                               name: Optional[str] = None, depends_on: Optional[str] = None) -> str:
+        return await self._submit_async(*self._tops_with_scheduler_job(hip_path, hda_node_path, scheduler_type, name, depends_on))
+
+    async def submit_tops_local_execution_async(self, hip_path: str, hda_node_path: str, name: Optional[str] = None) -> str:
+        return await self.submit_tops_with_scheduler_async(
+            hip_path=hip_path,
+            hda_node_path=hda_node_path,
+            scheduler_type="localscheduler",
+            name=name or f"TOPs_Local_{os.path.basename(hip_path)}"
+        )
+
+    async def get_tops_status_async(self, hip_path: str, hda_node_path: str, name: Optional[str] = None) -> str:
+        return await self._submit_async(*self._tops_status_job(hip_path, hda_node_path, name))
+
+
+atexit.register(DeadlineSubmitter._join_reapers)
@@ -1,9 +1,21 @@
 # pipeline/solaris_material_manager.py
 
 import os
+import re
+import json
+import hashlib
+import logging
+import tempfile
+import functools
+from contextlib import contextmanager
 from typing import List
 import hou
 
+from pipeline import LAYOUT_NODES
+
+# Per-material detail is logged at DEBUG; stage summaries at INFO
+log = logging.getLogger(__name__)
+
 # --- Helper Functions (Preserved and Enhanced) ---
 
 def safe_set_parm(node: hou.Node, parm_name: str, value):
@@ -18,56 +30,129 @@ def safe_set_parm(node: hou.Node, parm_name: str, value):
     if not parm:
         raise AttributeError(f"Node '{node.path()}' of type '{node.type().name()}' does not have a parameter named '{parm_name}'.")
     
+    _set_parm(node, parm, value)
+
+def _set_parm(node: hou.Node, parm: hou.Parm, value):
+    """Set an already looked-up parameter, logging which one failed."""
     try:
         parm.set(value)
     except hou.OperationFailed as e:
-        print(f"  [ERROR] Failed to set parameter '{parm_name}' on node '{node.path()}' to value '{value}'.")
+        log.error(f"  Failed to set parameter '{parm.name()}' on node '{node.path()}' to value '{value}'.")
         raise e
 
+def safe_set_parms(node: hou.Node, values: dict):
+    """
+    Sets several parameters in one node.setParms() call. Tuple values set whole
+    parm tuples (e.g. "t": (x, y, z)). If the batch fails, falls back to setting
+    each entry on its own so the offending parameter is reported clearly.
+    """
+    if not node:
+        raise ValueError(f"Attempted to set parameters {list(values)} on a None node.")
+
+    try:
+        node.setParms(values)
+    except hou.OperationFailed:
+        for parm_name, value in values.items():
+            if isinstance(value, tuple):
+                parm_tuple = node.parmTuple(parm_name)
+                if not parm_tuple:
+                    raise AttributeError(f"Node '{node.path()}' of type '{node.type().name()}' does not have a parameter tuple named '{parm_name}'.")
+                parm_tuple.set(value)
+            else:
+                safe_set_parm(node, parm_name, value)
+
+# Whether a node type has a given parameter, keyed by (node type name, parm name)
+_PARM_EXISTS = {}
+
+def node_type_has_parm(node: hou.Node, parm_name: str) -> bool:
+    """Check for a parameter once per node type instead of probing every node."""
+    key = (node.type().name(), parm_name)
+    if key not in _PARM_EXISTS:
+        _PARM_EXISTS[key] = node.parm(parm_name) is not None
+    return _PARM_EXISTS[key]
+
+# File parameter name resolved per node type; MaterialX image nodes always use 'file'
+_FILE_PARM_BY_TYPE = {
+    "mtlximage": "file",
+    "texture::2.0": "map",
+    "principledshader::2.0": "basecolor_texture",
+}
+
 def set_file_parameter(node, filepath):
-    """Helper to set a file parameter on a node, trying different common parameter names."""
+    """
+    Helper to set a file parameter on a node, trying different common parameter names.
+    The name that works is remembered per node type, so later nodes of the same
+    type need a single parm lookup.
+    """
+    type_name = node.type().name()
+    cached_name = _FILE_PARM_BY_TYPE.get(type_name)
     param_names = ['filename', 'file', 'map', 'tex0', 'texture', 'map1']
+    if cached_name:
+        param_names.insert(0, cached_name)
     
     for name in param_names:
-        if node.parm(name):
-            safe_set_parm(node, name, filepath)
+        parm = node.parm(name)
+        if parm:
+            _set_parm(node, parm, filepath)
+            _FILE_PARM_BY_TYPE[type_name] = name
             return True
     
     for parm in node.parms():
         if 'file' in parm.name().lower():
-            safe_set_parm(node, parm.name(), filepath)
+            _set_parm(node, parm, filepath)
+            _FILE_PARM_BY_TYPE[type_name] = parm.name()
             return True
 
-    print(f"  [ERROR] Could not find a suitable file parameter on node '{node.name()}'.")
+    log.error(f"  Could not find a suitable file parameter on node '{node.name()}'.")
     return False
 
+# Fallback input indices on mtlxstandard_surface, used when labels/names don't match
+_MTLX_STD_INPUTS = {
+    "base_color": 1, "base": 1, "metallic": 3, "metalness": 3,
+    "specular_roughness": 6, "roughness": 6, "normal": 40,
+}
+# Lower-cased input label/name -> input index, built once per node type
+_INPUT_TABLE_BY_TYPE = {}
+
+def _resolve_input_index(dest_node, input_name: str):
+    """
+    Find the input index for input_name on dest_node's type. Labels and names are
+    read once per node type into a lookup table, so every later connection is a
+    dict lookup with no HOM calls.
+    """
+    type_name = dest_node.type().name()
+    table = _INPUT_TABLE_BY_TYPE.get(type_name)
+    if table is None:
+        table = {}
+        for candidates in (dest_node.inputLabels(), dest_node.inputNames()):
+            for i, candidate in enumerate(candidates):
+                table.setdefault(candidate.lower(), i)
+        _INPUT_TABLE_BY_TYPE[type_name] = table
+    return table.get(input_name, _MTLX_STD_INPUTS.get(input_name))
+
 def connect_vop_nodes(dest_node, dest_input_name, src_node, src_output_idx=0):
-    """Connect VOP nodes. Attempts several connection methods for robustness."""
-    try:
-        for i, input_item in enumerate(dest_node.inputLabels()):
-            if input_item.lower() == dest_input_name.lower():
-                dest_node.setInput(i, src_node, src_output_idx)
-                return True
-        
-        for i, input_item in enumerate(dest_node.inputNames()):
-             if input_item.lower() == dest_input_name.lower():
-                dest_node.setInput(i, src_node, src_output_idx)
-                return True
-
-        input_map = {
-            "base_color": 1, "base": 1, "metallic": 3, "metalness": 3, 
-            "specular_roughness": 6, "roughness": 6, "normal": 40,
-        }
-        if dest_input_name.lower() in input_map:
-            dest_node.setInput(input_map[dest_input_name.lower()], src_node, src_output_idx)
-            return True
-            
-    except Exception as e:
-        print(f"    [WARNING] Failed to connect '{src_node.name()}' to '{dest_node.name()}.{dest_input_name}': {e}")
-    
-    print(f"    [ERROR] Could not find input '{dest_input_name}' on node '{dest_node.name()}'")
-    return False
+    """Connect VOP nodes, matching dest_input_name against input labels, then names, then known indices."""
+    index = _resolve_input_index(dest_node, dest_input_name.lower())
+    if index is None:
+        log.error(f"    Could not find input '{dest_input_name}' on node '{dest_node.name()}'")
+        return False
 
+    try:
+        dest_node.setInput(index, src_node, src_output_idx)
+        return True
+    except (hou.OperationFailed, hou.InvalidInput) as e:
+        log.warning(f"    Failed to connect '{src_node.name()}' to '{dest_node.name()}.{dest_input_name}': {e}")
+        return False
+
+# 'nan_<id>...' -> '<id>'
+_NAN_PREFIX_RE = re.compile(r"^nan_([^_]*)")
+# Everything before the first '_<suffix>' part (after the first part) that looks like
+# a random identifier: 9+ alphanumerics containing a digit, or 9+ uppercase letters
+_RANDOM_SUFFIX_RE = re.compile(
+    r"^(?P<head>[^_]*(?:_[^_]*)*?)_(?=[A-Za-z0-9]{9,}(?:_|$))(?:[A-Za-z0-9]*[0-9]|[A-Z]+(?:_|$))"
+)
+
+@functools.lru_cache(maxsize=4096)
 def extract_base_identifier(prefix: str) -> str:
     """
     Extract the base identifier from a prefix, removing any additional suffixes.
@@ -80,117 +165,214 @@ def extract_base_identifier(prefix: str) -> str:
     if prefix.endswith('_base'):
         prefix = prefix[:-5]  # Remove '_base'
     
-    # Split by underscore
-    parts = prefix.split('_')
-    
     # Special handling for 'nan_' prefix - return the part after 'nan_'
-    if len(parts) >= 2 and parts[0] == 'nan':
-        return parts[1]
-    
-    # For other cases, look for random suffix patterns and return everything before them
-    if len(parts) >= 2:
-        # Check each part starting from the second one
-        for i in range(1, len(parts)):
-            part = parts[i]
-            # Check if this part looks like a random suffix
-            # (long alphanumeric string that's likely a unique identifier)
-            if len(part) > 8 and part.isalnum() and (part.isupper() or part.isdigit() or 
-                                                     any(c.isdigit() for c in part)):
-                # This looks like a random suffix, return everything before it
-                return '_'.join(parts[:i])
+    match = _NAN_PREFIX_RE.match(prefix)
+    if match:
+        return match.group(1)
+    
+    # For other cases, return everything before the first random-looking suffix part
+    match = _RANDOM_SUFFIX_RE.match(prefix)
+    if match:
+        return match.group('head')
     
     # If no random suffix pattern found, return the full prefix
     return prefix
 
 def clear_lop_network_children(lop_network):
     """
-    Safely clear all children from a LOP network
+    Safely clear all children from a LOP network in a single deleteItems() call
     """
     try:
         children = lop_network.children()
         if children:
-            print(f"    Removing {len(children)} child nodes...")
-            for child in children:
+            if log.isEnabledFor(logging.DEBUG):
+                names = ", ".join(child.name() for child in children[:5])
+                log.debug(f"    Removing {len(children)} child nodes: {names}{', ...' if len(children) > 5 else ''}")
+            with hou.undos.disabler():
                 try:
-                    print(f"      Removing node: {child.name()}")
-                    child.destroy()
-                except Exception as e:
-                    print(f"      Warning: Could not destroy node {child.name()}: {e}")
-            print(f"    Successfully cleared LOP network.")
+                    lop_network.deleteItems(children)
+                except hou.OperationFailed as e:
+                    # e.g. a locked child; fall back to removing what we can one at a time
+                    log.warning(f"    Batch delete failed ({e}), removing nodes individually...")
+                    for child in children:
+                        try:
+                            child.destroy()
+                        except hou.OperationFailed as child_error:
+                            log.warning(f"      Could not destroy node {child.name()}: {child_error}")
+            log.debug(f"    Successfully cleared LOP network.")
         else:
-            print(f"    LOP network is already empty.")
+            log.debug(f"    LOP network is already empty.")
     except Exception as e:
-        print(f"    Error clearing LOP network: {e}")
+        log.error(f"    Error clearing LOP network: {e}")
         raise
 
+@contextmanager
+def batched_network_edits():
+    """
+    Run a scripted network build with undo recording off and Houdini in manual
+    update mode, so node creation, parm sets and connections don't trigger cooks
+    along the way. The previous update mode is restored afterwards. Can also be
+    used as a decorator.
+    """
+    previous_mode = hou.updateModeSetting()
+    hou.setUpdateMode(hou.updateMode.Manual)
+    try:
+        with hou.undos.disabler():
+            yield
+    finally:
+        hou.setUpdateMode(previous_mode)
+
 # --- Solaris/LOPs Workflow Functions ---
 
-def find_texture_files(assets_dir: str, base_id: str) -> dict:
+# Directory listings of assets folders, keyed by path and invalidated by the directory's mtime
+_ASSETS_LISTING_CACHE = {}
+
+# Texture kind -> file name suffix
+_TEXTURE_SUFFIXES = {
+    'diffuse': '_texture_diff.png',
+    'mr': '_texture_MR.png',
+    'normal': '_texture_normal.png',
+}
+_EMPTY_TEXTURE_INDEX = {kind: {} for kind in _TEXTURE_SUFFIXES}
+
+def build_texture_index(assets_dir: str) -> dict:
+    """
+    Index the texture PNGs in assets_dir with a single os.scandir() pass.
+    Returns a dict mapping each texture kind ('diffuse', 'mr', 'normal') to a
+    {base_id: file name} dict, where base_id is extract_base_identifier() of the
+    name with its texture suffix stripped. Looking up a prefix's textures is then
+    three dict lookups with no filesystem access.
+    """
+    names = {kind: [] for kind in _TEXTURE_SUFFIXES}
+    with os.scandir(assets_dir) as entries:
+        for entry in entries:
+            for kind, suffix in _TEXTURE_SUFFIXES.items():
+                if entry.name.endswith(suffix) and entry.is_file():
+                    names[kind].append(entry.name)
+                    break
+
+    index = {}
+    for kind, kind_names in names.items():
+        suffix_len = len(_TEXTURE_SUFFIXES[kind])
+        # Sorted so that, as before, the last matching file name wins
+        index[kind] = {extract_base_identifier(name[:-suffix_len]): name for name in sorted(kind_names)}
+    return index
+
+# Texture indexes are kept between Houdini sessions in this directory, one JSON
+# file per assets folder, so nothing is written into the asset tree itself
+TEXTURE_INDEX_DIR = os.environ.get(
+    "STYROFOAM_TEXTURE_INDEX_DIR", os.path.join(tempfile.gettempdir(), "styrofoam_texture_index")
+)
+
+def _texture_index_path(assets_dir: str) -> str:
+    key = hashlib.sha1(os.path.abspath(assets_dir).encode("utf-8")).hexdigest()
+    return os.path.join(TEXTURE_INDEX_DIR, f"{key}.json")
+
+def _valid_texture_index(index) -> bool:
+    """True if index has exactly the texture kinds, each a {str: str} dict."""
+    return (
+        isinstance(index, dict)
+        and index.keys() == _TEXTURE_SUFFIXES.keys()
+        and all(
+            isinstance(by_id, dict)
+            and all(isinstance(k, str) and isinstance(v, str) for k, v in by_id.items())
+            for by_id in index.values()
+        )
+    )
+
+def _load_texture_index(assets_dir: str, mtime: int):
+    """
+    Return the texture index saved for assets_dir if it was written for this
+    directory modification time and is well formed, otherwise None.
+    """
+    try:
+        with open(_texture_index_path(assets_dir), "r") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(saved, dict):
+        return None
+    if saved.get("assets_dir") != os.path.abspath(assets_dir) or saved.get("mtime_ns") != mtime:
+        return None
+    index = saved.get("index")
+    return index if _valid_texture_index(index) else None
+
+def _save_texture_index(assets_dir: str, mtime: int, index: dict) -> None:
+    """Save the texture index of assets_dir for the given directory modification time."""
+    try:
+        os.makedirs(TEXTURE_INDEX_DIR, exist_ok=True)
+        with open(_texture_index_path(assets_dir), "w") as f:
+            json.dump({"assets_dir": os.path.abspath(assets_dir), "mtime_ns": mtime, "index": index}, f)
+    except OSError as e:
+        log.debug(f"Could not save texture index for {assets_dir}: {e}")
+
+def _scan_assets(assets_dir: str) -> dict:
+    """
+    Return build_texture_index(assets_dir), rescanning the directory only when its
+    modification time changes. The index is also saved under TEXTURE_INDEX_DIR, so
+    a new session can skip the scan if the directory has not changed since.
+    An unreadable or missing directory has no textures.
+    """
+    try:
+        mtime = os.stat(assets_dir).st_mtime_ns
+    except OSError:
+        return _EMPTY_TEXTURE_INDEX
+    cached = _ASSETS_LISTING_CACHE.get(assets_dir)
+    if cached is None or cached[0] != mtime:
+        index = _load_texture_index(assets_dir, mtime)
+        if index is None:
+            index = build_texture_index(assets_dir)
+            _save_texture_index(assets_dir, mtime, index)
+        cached = (mtime, index)
+        _ASSETS_LISTING_CACHE[assets_dir] = cached
+    return cached[1]
+
+def find_texture_files(assets_dir: str, base_id: str, files: dict = None) -> dict:
     """
     Scan the assets directory for PNG files that match the base_id pattern.
     Returns a dict with 'diffuse', 'mr', and 'normal' texture paths.
+
+    Args:
+        assets_dir: Directory containing the texture PNGs
+        base_id: Base identifier the texture file names must contain
+        files: Pre-built index of assets_dir (see build_texture_index); scanned if omitted
     """
-    import glob
-    
-    # Get all PNG files in the assets directory
-    png_files = glob.glob(os.path.join(assets_dir, "*.png"))
+    if files is None:
+        files = _scan_assets(assets_dir)
     
     textures = {'diffuse': None, 'mr': None, 'normal': None}
+    dir_prefix = os.path.join(assets_dir, "")  # Joined once; file names are appended directly
     
-    for png_file in png_files:
-        filename = os.path.basename(png_file)
-        
-        # Check if this file belongs to our base_id
-        if base_id in filename:
-            if '_texture_diff.png' in filename:
-                textures['diffuse'] = png_file
-            elif '_texture_MR.png' in filename:
-                textures['mr'] = png_file
-            elif '_texture_normal.png' in filename:
-                textures['normal'] = png_file
+    for kind, by_id in files.items():
+        filename = by_id.get(base_id)
+        if filename is None:
+            # Texture names that don't reduce to base_id: fall back to a substring match
+            filename = next((name for name in reversed(by_id.values()) if base_id in name), None)
+        if filename is not None:
+            textures[kind] = f"{dir_prefix}{filename}"
     
     return textures
 
 
-def create_solaris_mtlx_shader(material_library: hou.Node, prefix: str, assets_dir: str, material_counter: dict = None) -> hou.Node:
+# Name prefixes of the nodes _build_mtlx_subnet names after the material's base id
+_MTLX_ID_NODE_PREFIXES = ("", "diff_", "mr_", "sep_mr_", "nrm_", "nmap_")
+
+def _build_mtlx_subnet(material_library: hou.Node, material_name: str, unique_base_id: str, textures: dict,
+                       layout: bool = False) -> hou.Node:
     """
-    Inside a Material Library LOP, creates a subnetwork containing a MaterialX shader network.
+    Create a material subnet node by node, wiring only the textures that were found.
+    Callers run inside batched_network_edits(), which already disables undos.
     """
-    # Extract the clean base identifier for naming
-    base_id = extract_base_identifier(prefix.strip())
-    
-    # Handle duplicate base identifiers by adding a counter
-    if material_counter is None:
-        material_counter = {}
-    
-    if base_id in material_counter:
-        material_counter[base_id] += 1
-        unique_base_id = f"{base_id}_{material_counter[base_id]}"
-    else:
-        material_counter[base_id] = 0
-        unique_base_id = base_id
-    
-    material_name = f"{unique_base_id}_base_material"
-    
-    # Find texture files by scanning the assets directory
-    textures = find_texture_files(assets_dir, base_id)
-    
-    print(f"\nCreating Solaris material for: {material_name} (base_id: {base_id})")
-    print(f"  Scanning assets folder for textures matching '{base_id}':")
-    print(f"    Diffuse: {textures['diffuse'] or 'Not found'} {'✓' if textures['diffuse'] else '✗'}")
-    print(f"    MR: {textures['mr'] or 'Not found'} {'✓' if textures['mr'] else '✗'}")
-    print(f"    Normal: {textures['normal'] or 'Not found'} {'✓' if textures['normal'] else '✗'}")
-
     # Create a subnet for the material inside the Material Library
     subnet = material_library.createNode("subnet", material_name)
 
     # --- Create nodes inside the subnet ---
     # Output connector
     out_surf = subnet.createNode("subnetconnector", "Surface_Out")
-    safe_set_parm(out_surf, "connectorkind", "output")
-    safe_set_parm(out_surf, "parmname", "surface")
-    safe_set_parm(out_surf, "parmlabel", "surface")
-    safe_set_parm(out_surf, "parmtype", "surface")
+    safe_set_parms(out_surf, {
+        "connectorkind": "output", "parmname": "surface",
+        "parmlabel": "surface", "parmtype": "surface",
+    })
 
     # Standard Surface - This is the actual material that gets exported.
     std_surface = subnet.createNode("mtlxstandard_surface", unique_base_id)
@@ -206,13 +388,12 @@ def create_solaris_mtlx_shader(material_library: hou.Node, prefix: str, assets_d
         safe_set_parm(img_diff, "signature", "color3")
         if set_file_parameter(img_diff, textures['diffuse']):
             # Connect diffuse image to base_color input
-            try:
-                std_surface.setInput(1, img_diff)  # Input 1 is base_color
-                print(f"    ✓ Connected diffuse texture")
-            except:
-                print(f"    ✗ Failed to connect diffuse texture")
+            if connect_vop_nodes(std_surface, "base_color", img_diff):
+                log.debug(f"    ✓ Connected diffuse texture")
+            else:
+                log.warning(f"    ✗ Failed to connect diffuse texture")
         else:
-            print(f"    ✗ Failed to set diffuse file parameter")
+            log.warning(f"    ✗ Failed to set diffuse file parameter")
 
     # Create and connect metallic/roughness texture
     if textures['mr']:
@@ -222,36 +403,15 @@ def create_solaris_mtlx_shader(material_library: hou.Node, prefix: str, assets_d
             # Create separate node to split RGB channels
             sep_mr = subnet.createNode("mtlxseparate3c", f"sep_mr_{unique_base_id}")
             sep_mr.setInput(0, img_mr)
-            
-            try:
-                # Find the correct input indices for metallic and specular roughness
-                # Print available inputs for debugging
-                input_labels = std_surface.inputLabels()
-                print(f"    Available inputs: {[f'{i}:{label}' for i, label in enumerate(input_labels)]}")
-                
-                # Try to find metallic and specular roughness inputs by name
-                metallic_input = None
-                roughness_input = None
-                
-                for i, label in enumerate(input_labels):
-                    if 'metallic' in label.lower():
-                        metallic_input = i
-                    elif 'roughness' in label.lower() and 'specular' in label.lower():
-                        roughness_input = i
-                
-                if metallic_input is not None and roughness_input is not None:
-                    std_surface.setInput(roughness_input, sep_mr, 1)  # G channel to specular roughness
-                    std_surface.setInput(metallic_input, sep_mr, 2)    # B channel to metallic
-                    print(f"    ✓ Connected G→specular_roughness (input {roughness_input}), B→metallic (input {metallic_input})")
-                else:
-                    # Fallback to common indices if labels don't match
-                    std_surface.setInput(6, sep_mr, 1)  # G channel to specular roughness
-                    std_surface.setInput(3, sep_mr, 2)  # B channel to metallic
-                    print(f"    ✓ Connected metallic/roughness using fallback indices - G→roughness (6), B→metallic (3)")
-            except Exception as e:
-                print(f"    ✗ Failed to connect metallic/roughness: {e}")
+
+            # G channel to specular roughness, B channel to metalness
+            if (connect_vop_nodes(std_surface, "specular_roughness", sep_mr, 1)
+                    and connect_vop_nodes(std_surface, "metalness", sep_mr, 2)):
+                log.debug(f"    ✓ Connected G→specular_roughness, B→metalness")
+            else:
+                log.warning(f"    ✗ Failed to connect metallic/roughness")
         else:
-            print(f"    ✗ Failed to set MR file parameter")
+            log.warning(f"    ✗ Failed to set MR file parameter")
 
     # Create and connect normal map
     if textures['normal']:
@@ -261,25 +421,105 @@ def create_solaris_mtlx_shader(material_library: hou.Node, prefix: str, assets_d
             # Create normal map node
             nmap_node = subnet.createNode("mtlxnormalmap", f"nmap_{unique_base_id}")
             nmap_node.setInput(0, img_nrm)
-            
-            try:
-                # Connect normal map to normal input (input 40)
-                std_surface.setInput(40, nmap_node)
-                print(f"    ✓ Connected normal map")
-            except:
-                print(f"    ✗ Failed to connect normal map")
+
+            if connect_vop_nodes(std_surface, "normal", nmap_node):
+                log.debug(f"    ✓ Connected normal map")
+            else:
+                log.warning(f"    ✗ Failed to connect normal map")
         else:
-            print(f"    ✗ Failed to set normal file parameter")
+            log.warning(f"    ✗ Failed to set normal file parameter")
 
-    # Layout nodes in the subnet
-    subnet.layoutChildren()
+    # Layout nodes in the subnet (clones of this subnet keep its positions)
+    if layout and LAYOUT_NODES:
+        subnet.layoutChildren()
+    return subnet
+
+def _clone_mtlx_subnet(prototype: hou.Node, prototype_id: str, material_library: hou.Node,
+                       material_name: str, unique_base_id: str, textures: dict) -> hou.Node:
+    """
+    Copy a subnet built by _build_mtlx_subnet for the same set of textures, then
+    rename its nodes and point its image nodes at this material's files. One
+    copyNodesTo() replaces the per-node createNode/setParms/setInput calls.
+    """
+    subnet = hou.copyNodesTo([prototype], material_library)[0]
+    subnet.setName(material_name)
+
+    # Rename only the nodes _build_mtlx_subnet names after the base id
+    for prefix in _MTLX_ID_NODE_PREFIXES:
+        child = subnet.node(prefix + prototype_id)
+        if child is not None:
+            child.setName(prefix + unique_base_id)
+
+    for prefix, key in (("diff", "diffuse"), ("mr", "mr"), ("nrm", "normal")):
+        if textures[key]:
+            set_file_parameter(subnet.node(f"{prefix}_{unique_base_id}"), textures[key])
+
+    log.debug(f"    ✓ Cloned material network from '{prototype.name()}'")
     return subnet
 
-def create_plastic_material(material_library: hou.Node) -> hou.Node:
+def create_solaris_mtlx_shader(material_library: hou.Node, prefix: str, assets_dir: str, material_counter: dict = None,
+                               files: dict = None, prototypes: dict = None,
+                               layout: bool = False) -> hou.Node:
+    """
+    Inside a Material Library LOP, creates a subnetwork containing a MaterialX shader network.
+    Pass files (see build_texture_index) when building many materials to avoid rescanning.
+
+    When prototypes is given, the first subnet built for each combination of
+    found textures is recorded there and later materials with the same
+    combination are cloned from it instead of being built node by node.
+
+    The nodes inside the subnet are only laid out when layout is True.
+    """
+    # Extract the clean base identifier for naming
+    base_id = extract_base_identifier(prefix.strip())
+    
+    # Find texture files by scanning the assets directory
+    textures = find_texture_files(assets_dir, base_id, files)
+    
+    # Handle duplicate base identifiers by adding a counter
+    if material_counter is None:
+        material_counter = {}
+    
+    if base_id in material_counter:
+        material_counter[base_id] += 1
+        unique_base_id = f"{base_id}_{material_counter[base_id]}"
+    else:
+        material_counter[base_id] = 0
+        unique_base_id = base_id
+    
+    material_name = f"{unique_base_id}_base_material"
+    
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(f"\nCreating Solaris material for: {material_name} (base_id: {base_id})")
+        log.debug(f"  Scanning assets folder for textures matching '{base_id}':")
+        log.debug(f"    Diffuse: {textures['diffuse'] or 'Not found'} {'✓' if textures['diffuse'] else '✗'}")
+        log.debug(f"    MR: {textures['mr'] or 'Not found'} {'✓' if textures['mr'] else '✗'}")
+        log.debug(f"    Normal: {textures['normal'] or 'Not found'} {'✓' if textures['normal'] else '✗'}")
+
+    topology = (bool(textures['diffuse']), bool(textures['mr']), bool(textures['normal']))
+    if prototypes is not None and topology in prototypes:
+        subnet = _clone_mtlx_subnet(*prototypes[topology], material_library, material_name, unique_base_id, textures)
+    else:
+        subnet = _build_mtlx_subnet(material_library, material_name, unique_base_id, textures, layout)
+        if prototypes is not None:
+            prototypes[topology] = (subnet, unique_base_id)
+    return subnet
+
+# Plastic properties keyed by the mtlxstandard_surface parm names. Rebuilt from
+# the candidate names below if a Houdini build ever rejects these.
+_PLASTIC_PARMS = {"specular_roughness": 0.05, "transmission": 1.0}  # Very smooth/glossy, fully transparent
+_PLASTIC_PARM_CANDIDATES = (
+    (("specular_roughness", "roughness", "inputs:specular_roughness"), 0.05),
+    (("transmission", "inputs:transmission", "transmission_weight"), 1.0),
+)
+
+
+def create_plastic_material(material_library: hou.Node, layout: bool = False) -> hou.Node:
     """
     Create a plastic material with specific properties inside the Material Library.
+    The nodes inside the subnet are only laid out when layout is True.
     """
-    print(f"\nCreating plastic material...")
+    log.info(f"\nCreating plastic material...")
     
     # Create a subnet for the plastic material
     subnet = material_library.createNode("subnet", "plastic")
@@ -287,10 +527,10 @@ def create_plastic_material(material_library: hou.Node) -> hou.Node:
     # --- Create nodes inside the subnet ---
     # Output connector
     out_surf = subnet.createNode("subnetconnector", "Surface_Out")
-    safe_set_parm(out_surf, "connectorkind", "output")
-    safe_set_parm(out_surf, "parmname", "surface")
-    safe_set_parm(out_surf, "parmlabel", "surface")
-    safe_set_parm(out_surf, "parmtype", "surface")
+    safe_set_parms(out_surf, {
+        "connectorkind": "output", "parmname": "surface",
+        "parmlabel": "surface", "parmtype": "surface",
+    })
 
     # Standard Surface for plastic
     std_surface = subnet.createNode("mtlxstandard_surface", "plastic_surface")
@@ -299,43 +539,149 @@ def create_plastic_material(material_library: hou.Node) -> hou.Node:
     # Connect surface to the subnet's output
     out_surf.setInput(0, std_surface)
 
-    # Set plastic material properties
+    # Set plastic material properties with the known parm names, and only probe
+    # the candidate names if this build's mtlxstandard_surface rejects them
+    global _PLASTIC_PARMS
     try:
-        # Set specular roughness to 0.05 (very smooth/glossy)
-        if std_surface.parm("specular_roughness"):
-            safe_set_parm(std_surface, "specular_roughness", 0.05)
-            print(f"    ✓ Set specular roughness to 0.05")
-        
-        # Set transmission to 1.0 (fully transparent)
-        if std_surface.parm("transmission"):
-            safe_set_parm(std_surface, "transmission", 1.0)
-            print(f"    ✓ Set transmission to 1.0")
-        
-        # Try alternative parameter names if the above don't work
-        for roughness_parm in ["roughness", "specular_roughness", "inputs:specular_roughness"]:
-            if std_surface.parm(roughness_parm):
-                safe_set_parm(std_surface, roughness_parm, 0.05)
-                print(f"    ✓ Set {roughness_parm} to 0.05")
-                break
-        
-        for transmission_parm in ["transmission", "inputs:transmission", "transmission_weight"]:
-            if std_surface.parm(transmission_parm):
-                safe_set_parm(std_surface, transmission_parm, 1.0)
-                print(f"    ✓ Set {transmission_parm} to 1.0")
-                break
+        plastic_parms = _PLASTIC_PARMS
+        try:
+            std_surface.setParms(plastic_parms)
+        except hou.OperationFailed:
+            plastic_parms = {}
+            for candidates, value in _PLASTIC_PARM_CANDIDATES:
+                parm_name = next((name for name in candidates if node_type_has_parm(std_surface, name)), None)
+                if parm_name:
+                    plastic_parms[parm_name] = value
+            safe_set_parms(std_surface, plastic_parms)
+            # Only remember the rediscovered names once they have been set successfully
+            _PLASTIC_PARMS = plastic_parms
+        for parm_name, value in plastic_parms.items():
+            log.debug(f"    ✓ Set {parm_name} to {value}")
                 
-    except Exception as e:
-        print(f"    ✗ Warning: Could not set all plastic material properties: {e}")
+    except (hou.OperationFailed, AttributeError) as e:
+        log.warning(f"    ✗ Could not set all plastic material properties: {e}")
 
     # Layout nodes in the subnet
-    subnet.layoutChildren()
-    print(f"    ✓ Created plastic material")
+    if layout and LAYOUT_NODES:
+        subnet.layoutChildren()
+    log.info(f"    ✓ Created plastic material")
     return subnet
 
-def build_solaris_material_network(lop_net: hou.Node, prefixes: List[str], assets_dir: str, input_node: hou.Node = None) -> hou.Node:
+def unique_prefixes(prefixes: List[str]) -> List[str]:
+    """
+    Keep the first prefix for each base identifier, preserving order.
+    """
+    by_base_id = {}
+    for prefix in prefixes:
+        by_base_id.setdefault(extract_base_identifier(prefix.strip()), prefix)
+    return list(by_base_id.values())
+
+
+def material_prim_pattern(base_id: str) -> str:
+    """
+    Prim pattern matching the meshes the assignment VEX would bind to base_id:
+    meshes at or below a prim named <base_id>, Mesh_<base_id> or Mesh_<base_id>_*.
+    """
+    names = (base_id, f"Mesh_{base_id}", f"Mesh_{base_id}_*")
+    paths = " ".join(f"/**/{name} /**/{name}/**" for name in names)
+    return f"%type:Mesh & ({paths})"
+
+
+# VEX for wrangle_material_assign: binds each mesh prim to /materials/<id>_base_material
+_MATERIAL_ASSIGN_VEX = """// Skip material library primitives - don't assign materials to materials
+if(startswith(s@primpath, "/materials/")) {
+    return;
+}
+
+string material_id = "";
+
+// Diagnostics are only printed when the wrangle's "Debug Materials" toggle is on
+int debug = chi("debug_materials");
+
+// Look for Mesh_<id> or a 6-15 character A/B id in, in order: the prim name,
+// the USD name attribute, then the shallowest matching component of the path.
+// re_find returns the leftmost match, so one regex covers all three sources.
+string id_regex = "(?:^|/)(?:Mesh_([^/_]+)[^/]*|([AB][^/]{5,14}))(?:/|$)";
+for(int method = 0; method < 3 && material_id == ""; method++) {
+    string source = method == 0 ? usd_name(0, s@primpath)
+                  : method == 1 ? usd_attrib(0, s@primpath, "name")
+                  : s@primpath;
+    string groups[] = re_find(id_regex, source);
+    for(int i = 1; i < len(groups); i++) {
+        if(groups[i] != "") {
+            material_id = groups[i];
+            break;
+        }
+    }
+    if(debug) printf("Processing primitive: '%s', source %d: '%s', material ID: '%s'\\n", s@primpath, method, source, material_id);
+}
+
+// Assign material if we found a valid identifier
+if(material_id != "" && !startswith(material_id, "polySurface")) {
+    string material_path = "/materials/" + material_id + "_base_material";
+    if(debug) printf("Attempting to assign material: '%s'\\n", material_path);
+    
+    // Check if the material exists before trying to assign it
+    if(debug) {
+        if(usd_hasapi(0, material_path, "MaterialBindingAPI")) {
+            printf("Material exists, proceeding with assignment\\n");
+        } else {
+            printf("WARNING: Material path '%s' may not exist\\n", material_path);
+        }
+    }
+    
+    usd_addrelationshiptarget(0, s@primpath, "material:binding", material_path);
+    if(debug) printf("SUCCESS: Assigned material '%s' to primitive '%s'\\n", 
+                     material_path, s@primpath);
+} else {
+    if(debug) printf("FAILED: No valid material identifier found for primitive '%s'\\n", s@primpath);
+}"""
+
+# VEX for wrangle_plastic_assign: binds the plastic geometry to /materials/plastic
+_PLASTIC_ASSIGN_VEX = """// Assign plastic material to all plastic geometry
+string plastic_material_path = "/materials/plastic";
+int debug = chi("debug_materials");
+
+if(debug) printf("Assigning plastic material to primitive: '%s'\\n", s@primpath);
+
+// Assign the plastic material
+usd_addrelationshiptarget(0, s@primpath, "material:binding", plastic_material_path);
+if(debug) printf("SUCCESS: Assigned plastic material '%s' to primitive '%s'\\n", 
+                 plastic_material_path, s@primpath);
+"""
+
+def add_debug_toggle(wrangle):
+    """
+    Add the "Debug Materials" spare toggle read by the assignment VEX.
+    It defaults to off so the per-primitive printf logging is skipped.
+    """
+    try:
+        wrangle.addSpareParmTuple(
+            hou.ToggleParmTemplate("debug_materials", "Debug Materials", default_value=False)
+        )
+    except hou.OperationFailed as e:
+        log.warning(f"Could not add debug toggle to {wrangle.path()}: {e}")
+
+
+@batched_network_edits()
+def build_solaris_material_network(lop_net: hou.Node, prefixes: List[str], assets_dir: str, input_node: hou.Node = None,
+                                   layout_materials: bool = False, allow_duplicates: bool = False,
+                                   bind_with_patterns: bool = False) -> hou.Node:
     """
     Generates a Material Library, populates it with shaders inside subnets,
     and then creates an Attribute Wrangle to assign them.
+
+    Prefixes that resolve to the same base identifier are built once. Pass
+    allow_duplicates=True to give each of them its own numbered material.
+
+    Materials are bound by the wrangle_material_assign VEX, which works out each
+    mesh's material per primitive. Pass bind_with_patterns=True to bind them
+    with one Assign Material LOP instead, using a prim pattern per base
+    identifier (see material_prim_pattern).
+
+    Only the LOP network itself is laid out, once at the end. Pass
+    layout_materials=True to also lay out the material library and the inside
+    of each material subnet, e.g. when inspecting the build in the GUI.
     """
     if not lop_net or lop_net.type().name() != 'lopnet':
         raise ValueError(f"A valid LOP network ('lopnet') must be provided. Got type '{lop_net.type().name() if lop_net else 'None'}'.")
@@ -346,26 +692,22 @@ def build_solaris_material_network(lop_net: hou.Node, prefixes: List[str], asset
         if input_node:
             dome_light.setInput(0, input_node)
         
-        safe_set_parm(dome_light, "primpath", "/World/Lights/DomeLight")
-        
-        # Set HDRI texture
-        safe_set_parm(dome_light, "xn__inputstexturefile_r3ah", "$HIP/hdri/studio_small_09_2k.exr")
-        
-        # Set intensity
-        safe_set_parm(dome_light, "xn__inputsintensity_i0a", 1.0)
+        safe_set_parms(dome_light, {
+            "primpath": "/World/Lights/DomeLight",
+            "xn__inputstexturefile_r3ah": "$HIP/hdri/studio_small_09_2k.exr",  # HDRI texture
+            "xn__inputsintensity_i0a": 1.0,                                     # Intensity
+            "xn__karmalightrenderlightgeo_4fbf": True,                          # Render light geometry
+        })
         
-        # Enable render light geometry
-        safe_set_parm(dome_light, "xn__karmalightrenderlightgeo_4fbf", True)
-        
-        print("Added dome light with HDRI texture and render light geometry enabled.")
+        log.info("Added dome light with HDRI texture and render light geometry enabled.")
         
         # Create a separate merge for dome light (merges at the top)
         dome_merge = lop_net.createNode("merge", "dome_merge")
         dome_merge.setInput(0, dome_light)
 
     except Exception as e:
-        print(f"Warning: Could not create dome light: {e}")
-        print("Continuing without dome light...")
+        log.warning(f"Could not create dome light: {e}")
+        log.warning("Continuing without dome light...")
         dome_merge = input_node if input_node else None
 
     # 2. Create a merge node to combine everything else
@@ -374,277 +716,188 @@ def build_solaris_material_network(lop_net: hou.Node, prefixes: List[str], asset
     
     # 3. Create a Material Library LOP
     mat_lib = lop_net.createNode("materiallibrary", "generated_materials")
-    safe_set_parm(mat_lib, "matpathprefix", "/materials/")
-    safe_set_parm(mat_lib, "matflag1", 0)  # Set matflag to 0 by default
+    safe_set_parms(mat_lib, {
+        "matpathprefix": "/materials/",
+        "matflag1": 0,  # Set matflag to 0 by default
+    })
     
     # Material library gets connected to merge input 1
     merge_node.setInput(1, mat_lib)
     
     # 4. Populate the library by creating a shader for each prefix.
-    # Use a shared counter to handle duplicate base identifiers
+    # Use a shared counter to handle duplicate base identifiers, build each
+    # base identifier only once, and clone materials that share a texture
+    # layout from the first one built
     material_counter = {}
+    if not allow_duplicates:
+        prefixes = unique_prefixes(prefixes)
+    prototypes = {}
+    assets_dir = os.path.normpath(assets_dir)
+    asset_files = _scan_assets(assets_dir)
+    bindings = {}
     for prefix in prefixes:
-        create_solaris_mtlx_shader(mat_lib, prefix, assets_dir, material_counter)
+        subnet = create_solaris_mtlx_shader(mat_lib, prefix, assets_dir, material_counter, asset_files,
+                                            prototypes, layout_materials)
+        bindings.setdefault(extract_base_identifier(prefix.strip()), subnet.name())
     
     # 5. Create plastic material
-    create_plastic_material(mat_lib)
+    create_plastic_material(mat_lib, layout_materials)
         
-    mat_lib.layoutChildren()
-    print("\nSolaris Material Library created successfully.")
-
-    # 6. Create an Attribute Wrangle LOP for material assignment
-    wrangle_assign = lop_net.createNode("attribwrangle", "wrangle_material_assign")
-    wrangle_assign.setInput(0, merge_node)  # Connect to merge instead
-    
-    # Set the primpattern to only process Mesh primitives
-    safe_set_parm(wrangle_assign, "primpattern", "`lopinputprim('.', 0)` %type:Mesh")
-
-    # 6. Set the VEX snippet for assignment
-    vex_code = """// Skip material library primitives - don't assign materials to materials
-if(startswith(s@primpath, "/materials/")) {
-    return;
-}
-
-string material_id = "";
-
-// Method 1: Try to get material ID directly from primitive name
-// Since USD files are now modified, primitive names should be the base IDs
-string prim_name = usd_name(0, s@primpath);
-printf("Processing primitive: '%s', prim_name: '%s'\\n", s@primpath, prim_name);
-
-if(prim_name != "" && !startswith(prim_name, "polySurface")) {
-    // Check for Mesh_ prefix and extract the identifier after it
-    if(startswith(prim_name, "Mesh_")) {
-        string mesh_parts[] = split(prim_name, "_");
-        if(len(mesh_parts) >= 2) {
-            material_id = mesh_parts[1];  // Get the part after "Mesh_"
-            printf("Found material ID '%s' from Mesh_ prefix in primitive name\\n", material_id);
-        }
-    }
-    // Check if this looks like a direct base ID
-    else if(len(prim_name) >= 6 && len(prim_name) <= 15 && 
-       (startswith(prim_name, "B") || startswith(prim_name, "A"))) {
-        material_id = prim_name;
-        printf("Found material ID '%s' from primitive name\\n", material_id);
-    }
-}
-
-// Method 2: Try USD name attribute
-if(material_id == "") {
-    string name_attr = usd_attrib(0, s@primpath, "name");
-    printf("USD name attribute: '%s'\\n", name_attr);
-    
-    if(name_attr != "" && !startswith(name_attr, "polySurface")) {
-        // Check for Mesh_ prefix in name attribute
-        if(startswith(name_attr, "Mesh_")) {
-            string mesh_parts[] = split(name_attr, "_");
-            if(len(mesh_parts) >= 2) {
-                material_id = mesh_parts[1];  // Get the part after "Mesh_"
-                printf("Found material ID '%s' from Mesh_ prefix in name attribute\\n", material_id);
-            }
-        }
-        else if(len(name_attr) >= 6 && len(name_attr) <= 15 && 
-           (startswith(name_attr, "B") || startswith(name_attr, "A"))) {
-            material_id = name_attr;
-            printf("Found material ID '%s' from name attribute\\n", material_id);
-        }
-    }
-}
-
-// Method 3: Extract from primitive path
-if(material_id == "") {
-    string path_parts[] = split(s@primpath, "/");
-    printf("Path parts: ");
-    for(int i = 0; i < len(path_parts); i++) {
-        printf("'%s' ", path_parts[i]);
-    }
-    printf("\\n");
-    
-    for(int i = 0; i < len(path_parts); i++) {
-        string part = path_parts[i];
-        
-        // Check for Mesh_ prefix in path parts
-        if(startswith(part, "Mesh_")) {
-            string mesh_parts[] = split(part, "_");
-            if(len(mesh_parts) >= 2) {
-                material_id = mesh_parts[1];  // Get the part after "Mesh_"
-                printf("Found material ID '%s' from Mesh_ prefix in path\\n", material_id);
-                break;
-            }
-        }
-        // Look for base ID patterns in path
-        else if(len(part) >= 6 && len(part) <= 15 && 
-           (startswith(part, "B") || startswith(part, "A")) && 
-           part != "base" && !startswith(part, "polySurface")) {
-            material_id = part;
-            printf("Found material ID '%s' from primitive path\\n", material_id);
-            break;
-        }
-    }
-}
-
-// Assign material if we found a valid identifier
-if(material_id != "" && !startswith(material_id, "polySurface")) {
-    string material_path = "/materials/" + material_id + "_base_material";
-    printf("Attempting to assign material: '%s'\\n", material_path);
-    
-    // Check if the material exists before trying to assign it
-    if(usd_hasapi(0, material_path, "MaterialBindingAPI")) {
-        printf("Material exists, proceeding with assignment\\n");
-    } else {
-        printf("WARNING: Material path '%s' may not exist\\n", material_path);
-    }
-    
-    usd_addrelationshiptarget(0, s@primpath, "material:binding", material_path);
-    printf("SUCCESS: Assigned material '%s' to primitive '%s'\\n", 
-           material_path, s@primpath);
-} else {
-    printf("FAILED: No valid material identifier found for primitive '%s' (prim_name: '%s')\\n", 
-           s@primpath, prim_name);
-}"""
-
-    safe_set_parm(wrangle_assign, "snippet", vex_code)
-    print("Created Attribute Wrangle for material assignment.")
+    if layout_materials and LAYOUT_NODES:
+        mat_lib.layoutChildren()
+    log.info("\nSolaris Material Library created successfully.")
+
+    if bind_with_patterns:
+        # 6. Bind every material with one Assign Material LOP, one pattern per base id
+        assign_node = lop_net.createNode("assignmaterial", "assign_materials")
+        assign_node.setInput(0, merge_node)
+        assign_values = {"nummaterials": len(bindings)}
+        for i, (base_id, material_name) in enumerate(bindings.items(), 1):
+            assign_values[f"primpattern{i}"] = material_prim_pattern(base_id)
+            assign_values[f"matspecpath{i}"] = f"/materials/{material_name}"
+        safe_set_parms(assign_node, assign_values)
+        log.info(f"Created Assign Material LOP for {len(bindings)} materials.")
+    else:
+        # 6. Create an Attribute Wrangle LOP for material assignment
+        assign_node = lop_net.createNode("attribwrangle", "wrangle_material_assign")
+        assign_node.setInput(0, merge_node)  # Connect to merge instead
+        add_debug_toggle(assign_node)
+
+        # 6. Set the VEX snippet for assignment
+        safe_set_parms(assign_node, {
+            "primpattern": "`lopinputprim('.', 0)` %type:Mesh",  # Only process Mesh primitives
+            "snippet": _MATERIAL_ASSIGN_VEX,
+        })
+        log.info("Created Attribute Wrangle for material assignment.")
 
     # 7. Add separate plastic material assignment wrangle
     plastic_wrangle = lop_net.createNode("attribwrangle", "wrangle_plastic_assign")
-    plastic_wrangle.setInput(0, wrangle_assign)
-    
-    # Set the primpattern to target plastic geometry specifically
-    safe_set_parm(plastic_wrangle, "primpattern", "/import_plastic")
+    plastic_wrangle.setInput(0, assign_node)
+    add_debug_toggle(plastic_wrangle)
     
     # VEX code for plastic material assignment
-    plastic_vex_code = """// Assign plastic material to all plastic geometry
-string plastic_material_path = "/materials/plastic";
-
-printf("Assigning plastic material to primitive: '%s'\\n", s@primpath);
-
-// Assign the plastic material
-usd_addrelationshiptarget(0, s@primpath, "material:binding", plastic_material_path);
-printf("SUCCESS: Assigned plastic material '%s' to primitive '%s'\\n", 
-       plastic_material_path, s@primpath);
-"""
-    
-    safe_set_parm(plastic_wrangle, "snippet", plastic_vex_code)
-    print("Created separate Attribute Wrangle for plastic material assignment.")
+    safe_set_parms(plastic_wrangle, {
+        "primpattern": "/import_plastic",  # Target plastic geometry specifically
+        "snippet": _PLASTIC_ASSIGN_VEX,
+    })
+    log.info("Created separate Attribute Wrangle for plastic material assignment.")
 
     # 8. Add Camera positioned as requested
     camera_lop = lop_net.createNode("camera", "render_camera")
     camera_lop.setInput(0, plastic_wrangle)  # Connect to plastic wrangle instead
-    safe_set_parm(camera_lop, "primpath", "/World/Render/Camera")
-    safe_set_parm(camera_lop, "tx", -1.0)   # -1 on X axis
-    safe_set_parm(camera_lop, "ty", 0.3)    # 0.3 on Y axis  
-    safe_set_parm(camera_lop, "tz", 1.0)    # 1 on Z axis
-    safe_set_parm(camera_lop, "rx", -7.0)   # -7 degrees rotation X
-    safe_set_parm(camera_lop, "ry", -45.0)   # 45 degrees rotation Y
-    safe_set_parm(camera_lop, "rz", -1.0)   # -1 degrees rotation Z
-    print("Added render camera at (-1, 0.3, 1) with rotation (-7, 45, -1).")
+    safe_set_parms(camera_lop, {
+        "primpath": "/World/Render/Camera",
+        "t": (-1.0, 0.3, 1.0),     # Position
+        "r": (-7.0, -45.0, -1.0),  # Rotation in degrees
+    })
+    log.info("Added render camera at (-1, 0.3, 1) with rotation (-7, 45, -1).")
 
     # 9. Add Karma Render Settings - ensure we get the right node type
     karma_settings = None
     try:
         karma_settings = lop_net.createNode("karmarenderproperties", "karma_render_settings")
         karma_settings.setInput(0, camera_lop)
-        safe_set_parm(karma_settings, "camera", "/World/Render/Camera")
-        
-        # Set output picture path
-        safe_set_parm(karma_settings, "picture", "$HIP/render/model_`@model`.exr")
-        
-        # Set resolution mode to manual and set 1024x1024 resolution
-        safe_set_parm(karma_settings, "res_mode", "manual")  # Manual resolution mode
-        
-        # Set resolution - using parmTuple for the resolution parameter
-        resolution_tuple = karma_settings.parmTuple("resolution")
-        resolution_tuple.set((1024, 1024))
-        
-        # Set samples per pixel
-        safe_set_parm(karma_settings, "samplesperpixel", 64)  # Samples per pixel
-        print("✓ Successfully created Karma render settings with 1024x1024 resolution.")
+        safe_set_parms(karma_settings, {
+            "camera": "/World/Render/Camera",
+            "picture": "$HIP/render/model_`@model`.exr",  # Output picture path
+            "res_mode": "manual",                          # Manual resolution mode
+            "samplesperpixel": 64,                         # Samples per pixel
+            "resolution": (1024, 1024),                    # Output resolution
+        })
+        log.info("✓ Successfully created Karma render settings with 1024x1024 resolution.")
         
     except Exception as e:
-        print(f"ERROR: Could not create karmarenderproperties: {e}")
-        print("OUT_SCENE will connect to camera instead of render settings.")
+        log.error(f"Could not create karmarenderproperties: {e}")
+        log.warning("OUT_SCENE will connect to camera instead of render settings.")
         karma_settings = None
     
     # 10. Determine which node should be the input to OUT_SCENE
     if karma_settings is not None:
         final_input_node = karma_settings
-        print("✓ Using karma_render_settings as input to OUT_SCENE.")
+        log.info("✓ Using karma_render_settings as input to OUT_SCENE.")
     else:
         final_input_node = camera_lop
-        print("⚠ Using camera as input to OUT_SCENE (karma render settings failed).")
+        log.warning("⚠ Using camera as input to OUT_SCENE (karma render settings failed).")
     
     # 11. Create OUT_SCENE null as the absolute final node
     try:
         out_scene = lop_net.createNode("null", "OUT_SCENE")
         out_scene.setInput(0, final_input_node)
-        print(f"✓ Successfully connected OUT_SCENE to {final_input_node.name()}")
+        log.info(f"✓ Successfully connected OUT_SCENE to {final_input_node.name()}")
         
         # Set display flag on OUT_SCENE to make it the active node
         out_scene.setDisplayFlag(True)
-        print("✓ Set display flag on OUT_SCENE - this is now the final active node.")
+        log.info("✓ Set display flag on OUT_SCENE - this is now the final active node.")
         
     except Exception as e:
-        print(f"ERROR: Failed to create or connect OUT_SCENE: {e}")
-        print(f"Using {final_input_node.name()} as the final node instead.")
+        log.error(f"Failed to create or connect OUT_SCENE: {e}")
+        log.warning(f"Using {final_input_node.name()} as the final node instead.")
         final_input_node.setDisplayFlag(True)
         out_scene = final_input_node
 
     # Layout the parent network to keep things tidy
-    lop_net.layoutChildren()
+    if LAYOUT_NODES:
+        lop_net.layoutChildren()
     
     # Return OUT_SCENE as the final node in the chain
     return out_scene
 
 # --- High-Level Orchestrator Function ---
 
+def get_or_create_lopnet(name: str):
+    """
+    Find the LOP network /obj/<name>, creating it (and /obj) if needed.
+    Returns the network and whether it was created.
+    """
+    obj_node = hou.node("/obj")
+    if obj_node is None:
+        obj_node = hou.node("/").createNode("obj", "obj")
+
+    lop_net = obj_node.node(name)
+    if lop_net is not None:
+        return lop_net, False
+    return obj_node.createNode("lopnet", name), True
+
+
+@batched_network_edits()
 def setup_solaris_materials_from_sops(sop_geo_path: str, prefixes: List[str], assets_dir: str) -> hou.Node:
     """
     Finds or creates a LOP network, imports geometry, builds materials, and assigns them.
     Now works directly with the modified USD files created by hip_manager.
     """
-    print("--- Starting Solaris Material Setup ---")
+    log.info("--- Starting Solaris Material Setup ---")
     
     # 1. Get or create the LOP network using the robust pattern.
-    obj_node = hou.node("/obj")
-    if obj_node is None:
-        obj_node = hou.node("/").createNode("obj", "obj")
-
-    lopnet_name = "styrofoam_material_pipeline"
-    lop_net = obj_node.node(lopnet_name)
-    if lop_net is None:
-        lop_net = obj_node.createNode("lopnet", lopnet_name)
-        print(f"Created new LOP network at: '{lop_net.path()}'")
+    lop_net, created = get_or_create_lopnet("styrofoam_material_pipeline")
+    if created:
+        log.info(f"Created new LOP network at: '{lop_net.path()}'")
     else:
-        print(f"Found existing LOP network at '{lop_net.path()}'. Clearing its contents.")
+        log.info(f"Found existing LOP network at '{lop_net.path()}'. Clearing its contents.")
         clear_lop_network_children(lop_net)
 
     # 2. Create three separate SOP Import LOPs inside the LOP network
     
     # Model import (original geometry)
     sop_import_model = lop_net.createNode("sopimport", "import_model")
-    safe_set_parm(sop_import_model, "soppath", f"{sop_geo_path}/OUT_MODEL")
-    safe_set_parm(sop_import_model, "primpath", "/model")
-    print(f"Created SOP Import LOP for model geometry at '{sop_geo_path}/OUT_MODEL'.")
+    safe_set_parms(sop_import_model, {"soppath": f"{sop_geo_path}/OUT_MODEL", "primpath": "/model"})
+    log.info(f"Created SOP Import LOP for model geometry at '{sop_geo_path}/OUT_MODEL'.")
     
     # Plastic import
     sop_import_plastic = lop_net.createNode("sopimport", "import_plastic")
-    safe_set_parm(sop_import_plastic, "soppath", f"{sop_geo_path}/OUT_PLASTIC")
-    safe_set_parm(sop_import_plastic, "primpath", "/plastic")
-    print(f"Created SOP Import LOP for plastic geometry at '{sop_geo_path}/OUT_PLASTIC'.")
+    safe_set_parms(sop_import_plastic, {"soppath": f"{sop_geo_path}/OUT_PLASTIC", "primpath": "/plastic"})
+    log.info(f"Created SOP Import LOP for plastic geometry at '{sop_geo_path}/OUT_PLASTIC'.")
     
     # Styrofoam import
     sop_import_styrofoam = lop_net.createNode("sopimport", "import_styrofoam")
-    safe_set_parm(sop_import_styrofoam, "soppath", f"{sop_geo_path}/OUT_STYROFOAM")
-    safe_set_parm(sop_import_styrofoam, "primpath", "/styrofoam")
-    print(f"Created SOP Import LOP for styrofoam geometry at '{sop_geo_path}/OUT_STYROFOAM'.")
+    safe_set_parms(sop_import_styrofoam, {"soppath": f"{sop_geo_path}/OUT_STYROFOAM", "primpath": "/styrofoam"})
+    log.info(f"Created SOP Import LOP for styrofoam geometry at '{sop_geo_path}/OUT_STYROFOAM'.")
     
     # 3. Merge all geometry imports
     geometry_merge = lop_net.createNode("merge", "geometry_merge")
     geometry_merge.setInput(0, sop_import_model)
     geometry_merge.setInput(1, sop_import_plastic)
     geometry_merge.setInput(2, sop_import_styrofoam)
-    print(f"Created geometry merge node combining all three imports.")
+    log.info(f"Created geometry merge node combining all three imports.")
 
     # 4. Call the material network builder
     final_node = build_solaris_material_network(
@@ -657,8 +910,8 @@ def setup_solaris_materials_from_sops(sop_geo_path: str, prefixes: List[str], as
     # 4. Set the display flag on the end of our new chain.
     final_node.setDisplayFlag(True)
     
-    print(f"\n--- Solaris Material Setup Complete ---")
-    print(f"Final node '{final_node.path()}' is now active.")
+    log.info(f"\n--- Solaris Material Setup Complete ---")
+    log.info(f"Final node '{final_node.path()}' is now active.")
     
     return final_node
 
@@ -678,26 +931,27 @@ if __name__ == "__main__":
         if not assets_geo:
             assets_geo = obj_net.createNode("geo", os.path.basename(SOP_GEO_PATH.strip('/')))
         
-        clear_lop_network_children(assets_geo)
+        with batched_network_edits():
+            clear_lop_network_children(assets_geo)
 
-        last_node = None
-        for i, prefix in enumerate(ASSET_PREFIXES):
-            box = assets_geo.createNode("box", prefix)
-            safe_set_parm(box, 'tx', i * 2.5)
+            last_node = None
+            for i, prefix in enumerate(ASSET_PREFIXES):
+                box = assets_geo.createNode("box", prefix)
+                safe_set_parm(box, 'tx', i * 2.5)
             
-            if last_node:
-                 merge_node = assets_geo.createNode("merge", f"merge_{i}")
-                 merge_node.setInput(0, last_node)
-                 merge_node.setInput(1, box)
-                 last_node = merge_node
-            else:
-                 last_node = box
+                if last_node:
+                     merge_node = assets_geo.createNode("merge", f"merge_{i}")
+                     merge_node.setInput(0, last_node)
+                     merge_node.setInput(1, box)
+                     last_node = merge_node
+                else:
+                     last_node = box
         
-        out_null = assets_geo.createNode("null", "OUT_ASSETS")
-        out_null.setInput(0, last_node)
-        out_null.setDisplayFlag(True)
-        out_null.setRenderFlag(True)
-        assets_geo.layoutChildren()
+            out_null = assets_geo.createNode("null", "OUT_ASSETS")
+            out_null.setInput(0, last_node)
+            out_null.setDisplayFlag(True)
+            out_null.setRenderFlag(True)
+            assets_geo.layoutChildren()
         print("Dummy geometry created.")
 
         setup_solaris_materials_from_sops(
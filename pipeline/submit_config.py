@@ -1,11 +1,36 @@
 
 import hou
-import time
+
+def find_output_top(hda_node):
+    """
+    Return the TOP node the HDA's cook button cooks: the display node of the
+    first TOP network inside the HDA, falling back to /tasks/topnet1.
+    """
+    for net in (hda_node,) + hda_node.allSubChildren():
+        if net.childTypeCategory() == hou.topNodeTypeCategory() and net.displayNode() is not None:
+            return net.displayNode()
+    topnet = hou.node("/tasks/topnet1")
+    return topnet.displayNode() if topnet is not None else None
+
+def report_when_cooked(top_node):
+    """
+    Print when top_node's graph finishes cooking. A PDG CookComplete handler
+    reports it the moment it happens instead of after a fixed wait, then removes
+    itself. Returns the handler, or None if the node has no graph context yet.
+    """
+    import pdg
+    context = top_node.getPDGGraphContext()
+    if context is None:
+        return None
+
+    def on_cook_complete(handler, event):
+        print(f"TOPs cook finished: {top_node.path()}")
+        handler.removeFromAllEmitters()
+
+    return context.addEventHandler(on_cook_complete, pdg.EventType.CookComplete, True)
 
 def load_and_execute_tops():
     """Load HIP file and execute TOPs workflow."""
-    time.sleep(3)  # Wait for GUI to be ready
-    
     hip_file_path = r"E:/Project_Work/Amazon/StyrofoamWrap/styrofoam_w_v01_007.hiplc"
     hda_node_path = "/obj/assets/wrapped_assets"
     scheduler_type = "deadline"
@@ -16,9 +41,9 @@ def load_and_execute_tops():
         print("SUCCESS: HIP file loaded!")
         
         print("Saving HIP file to resolve dependencies...")
-        hou.hipFile.save()
+        # hipFile.save() is synchronous; it raises on failure, so no polling is needed
+        hou.hipFile.save(save_to_recent_files=False)
         print("HIP file saved")
-        time.sleep(3)
         
         hda_node = hou.node(hda_node_path)
         if hda_node is None:
@@ -53,7 +78,6 @@ def load_and_execute_tops():
             hda_node.parm('topscheduler').set(scheduler_path)
             new_scheduler = hda_node.parm('topscheduler').eval()
             print(f"Set scheduler to: {new_scheduler}")
-            time.sleep(1)
         else:
             print("Warning: topscheduler parameter not found on HDA")
         
@@ -70,13 +94,16 @@ def load_and_execute_tops():
             
         print("SUCCESS: Found required TOPs control parameters")
         
-        # Execute the TOPs workflow
+        # Execute the TOPs workflow. The dirty button returns once the work items
+        # are dirtied, so cook straight away and let PDG report when it is done.
         print("Dirtying TOPs network...")
         dirty_param.pressButton()
-        time.sleep(3)
         
         print("Cooking TOPs network...")
         print("NOTE: Please click 'Save and Continue' if a dialog appears")
+        top_node = find_output_top(hda_node)
+        if top_node is not None:
+            report_when_cooked(top_node)
         cook_param.pressButton()
         
         print("SUCCESS: TOPs workflow execution initiated!")
@@ -87,21 +114,17 @@ def load_and_execute_tops():
         import traceback
         traceback.print_exc()
 
-# Set up timer for delayed execution after UI is ready
+def run_when_ui_ready():
+    """Event loop callback: runs once, as soon as the UI is idle, then removes itself."""
+    hou.ui.removeEventLoopCallback(run_when_ui_ready)
+    load_and_execute_tops()
+
+# Run once the UI event loop is up instead of after a fixed delay. The first idle
+# callback means the event loop is running, not that the main window has
+# finished painting; nothing here needs the window drawn, only hou to be ready.
 if hou.isUIAvailable():
-    try:
-        from PySide2.QtCore import QTimer
-        timer = QTimer()
-        timer.timeout.connect(load_and_execute_tops)
-        timer.setSingleShot(True)
-        timer.start(8000)  # 8 second delay
-        print("Startup timer set - will load HIP file and execute TOPs in 8 seconds")
-        print("NOTE: You may need to click 'Save and Continue' if prompted")
-    except ImportError:
-        print("PySide2 not available, trying threading approach")
-        import threading
-        threading.Timer(8.0, load_and_execute_tops).start()
-        print("Using threading timer - will load HIP file and execute TOPs in 8 seconds")
-        print("NOTE: You may need to click 'Save and Continue' if prompted")
+    hou.ui.addEventLoopCallback(run_when_ui_ready)
+    print("Startup callback set - will load HIP file and execute TOPs once the UI is ready")
+    print("NOTE: You may need to click 'Save and Continue' if prompted")
 else:
     print("UI not available")
@@ -0,0 +1,138 @@
+import hou
+
+DEFAULT_HDA_PATH = "/obj/assets/wrapped_assets"
+SCHEDULER_PATHS = {
+    "local": "/tasks/topnet1/localscheduler",
+    "deadline": "/tasks/topnet1/deadlinescheduler",
+}
+
+# find_output_top() and report_when_cooked() are copied verbatim into the
+# generated submit_config.py (see pipeline/submit_config_generator.py), which
+# has to run without this folder on sys.path; keep the two in step.
+
+def find_output_top(hda_node):
+    """
+    Return the TOP node the HDA's cook button cooks: the display node of the
+    first TOP network inside the HDA, falling back to /tasks/topnet1.
+    """
+    for net in (hda_node,) + hda_node.allSubChildren():
+        if net.childTypeCategory() == hou.topNodeTypeCategory() and net.displayNode() is not None:
+            return net.displayNode()
+    topnet = hou.node("/tasks/topnet1")
+    return topnet.displayNode() if topnet is not None else None
+
+def print_available_nodes(hda_path, limit=20):
+    """
+    Help find a missing HDA: list nodes under /obj named like it, matched by
+    Houdini's own glob so only the candidates are returned to Python.
+    """
+    obj_node = hou.node("/obj")
+    if obj_node is None:
+        return
+    name = hda_path.rstrip("/").rsplit("/", 1)[-1]
+    matches = obj_node.recursiveGlob(f"*{name}*") or obj_node.glob("*")
+    print("Candidate nodes for debugging:")
+    for node in matches[:limit]:
+        print(f"  - {node.path()} ({node.type().name()})")
+    if len(matches) > limit:
+        print(f"  ... and {len(matches) - limit} more")
+
+def report_when_cooked(top_node):
+    """
+    Print when top_node's graph finishes cooking. A PDG CookComplete handler
+    reports it the moment it happens instead of after a fixed wait, then removes
+    itself. Returns the handler, or None if the node has no graph context yet.
+    """
+    import pdg
+    context = top_node.getPDGGraphContext()
+    if context is None:
+        return None
+
+    def on_cook_complete(handler, event):
+        print(f"TOPs cook finished: {top_node.path()}")
+        handler.removeFromAllEmitters()
+
+    return context.addEventHandler(on_cook_complete, pdg.EventType.CookComplete, True)
+
+def execute(hip_path=None, hda_path=DEFAULT_HDA_PATH, scheduler="local"):
+    """
+    Load hip_path (if given), save it once, point the HDA at the scheduler and
+    cook its TOP network. Returns True once the cook has been started.
+    """
+    try:
+        if hip_path:
+            print(f"Loading HIP file: {hip_path}")
+            hou.hipFile.load(hip_path)
+            print("SUCCESS: HIP file loaded!")
+
+            # One save resolves dependencies; it returns once the file is written
+            print("Saving HIP file to resolve dependencies...")
+            hou.hipFile.save(save_to_recent_files=False)
+            print("HIP file saved")
+
+        hda_node = hou.node(hda_path)
+        if hda_node is None:
+            print(f"ERROR: HDA node not found at {hda_path}")
+            print_available_nodes(hda_path)
+            return False
+
+        print(f"SUCCESS: Found HDA node {hda_node.name()} ({hda_node.type().name()})")
+
+        # Configure the scheduler
+        scheduler_parm = hda_node.parm('topscheduler')
+        if scheduler_parm:
+            scheduler_parm.set(SCHEDULER_PATHS.get(scheduler, scheduler))
+            print(f"Set scheduler to: {scheduler_parm.eval()}")
+        else:
+            print("Warning: topscheduler parameter not found on HDA")
+
+        top_node = find_output_top(hda_node)
+        if top_node is None:
+            print("ERROR: No TOP node found to cook")
+            return False
+
+        print(f"SUCCESS: Found TOP node {top_node.path()}")
+
+        # Dirty and cook through the TOP node API rather than pressing the HDA's
+        # dirtybutton/cookbutton: cookWorkItems() can skip the save prompt, which
+        # the buttons cannot, and the HIP file was saved above. Anything else the
+        # buttons' callbacks do is not run. Dirtying is synchronous, so the cook
+        # can start straight away.
+        print("Dirtying TOPs network...")
+        top_node.dirtyAllWorkItems(False)
+
+        print("Cooking TOPs network...")
+        report_when_cooked(top_node)
+        top_node.cookWorkItems(block=False, save_prompt=False)
+
+        print("SUCCESS: TOPs workflow execution initiated!")
+        print("Monitor progress in the TOPs network view")
+        return True
+
+    except Exception as e:
+        print(f"ERROR during auto-execution: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def schedule(hip_path=None, hda_path=DEFAULT_HDA_PATH, scheduler="local", delay=8.0):
+    """
+    Run execute() on Houdini's main thread once the UI has had delay seconds to
+    start. The wait is a QTimer.singleShot, so the event loop keeps running in
+    the meantime and no hou call is ever made from another thread.
+    """
+    if not hou.isUIAvailable():
+        print("UI not available")
+        return
+    run = lambda: execute(hip_path, hda_path, scheduler)
+    try:
+        # hutil.Qt resolves to PySide2 or PySide6, whichever this Houdini ships
+        from hutil.Qt.QtCore import QTimer
+        QTimer.singleShot(int(delay * 1000), run)
+    except ImportError:
+        # Only the wait happens off the main thread; hdefereval runs the hou calls
+        # back on it
+        import threading
+        import hdefereval
+        threading.Timer(delay, hdefereval.executeDeferred, (run,)).start()
+    print(f"Startup timer set - will execute TOPs in {delay:g} seconds")
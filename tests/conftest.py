@@ -0,0 +1,13 @@
+# tests/conftest.py
+
+import os
+import pytest
+
+
+@pytest.fixture
+def touch_files():
+    """Create empty files by name in a directory (open/close only, no utime like Path.touch)."""
+    def _touch(dirpath, names):
+        for name in names:
+            os.close(os.open(os.path.join(dirpath, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
+    return _touch
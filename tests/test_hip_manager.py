@@ -2,44 +2,167 @@
 
 import pytest
 import os
-import tempfile
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import MagicMock, mock_open
 from pathlib import Path
 
 # Import the module under test
 from pipeline import hip_manager as hm
 
 
+# Lightweight stand-ins for the hou nodes import_usds builds
+class FakeParm:
+    """A string parm that records the values it is set to; it is its own parm template."""
+    __slots__ = ('_name', '_type', 'values')
+
+    def __init__(self, name, type_id=0):
+        self._name = name
+        self._type = type_id
+        self.values = []
+
+    def name(self):
+        return self._name
+
+    def parmTemplate(self):
+        return self
+
+    def type(self):
+        return self._type
+
+    def set(self, value):
+        self.values.append(value)
+
+
+# Parms each created node type exposes through parms()
+FAKE_NODE_PARMS = {"usdimport": ("filepath1",)}
+
+
+class FakeNode:
+    """A node that records the children it creates and the inputs wired into it."""
+    __slots__ = ('_type', 'children', 'inputs', '_parms')
+
+    def __init__(self, type_name):
+        self._type = type_name
+        self.children = []
+        self.inputs = {}
+        self._parms = {name: FakeParm(name) for name in FAKE_NODE_PARMS.get(type_name, ())}
+
+    def createNode(self, type_name, name=None):
+        child = FakeNode(type_name)
+        self.children.append(child)
+        return child
+
+    def node(self, path):
+        return None  # No default file1 node
+
+    def parm(self, name):
+        if name not in self._parms:
+            self._parms[name] = FakeParm(name)
+        return self._parms[name]
+
+    def parms(self):
+        return list(self._parms.values())
+
+    def setInput(self, index, node, output=0):
+        self.inputs[index] = node
+
+    def typeName(self):
+        return self._type
+
+    def moveToGoodPosition(self):
+        pass
+
+    def setDisplayFlag(self, on):
+        pass
+
+    def layoutChildren(self):
+        pass
+
+    def destroy(self):
+        pass
+
+
 # Fixtures for mocking Houdini
+@pytest.fixture(scope="module")
+def shared_hou():
+    """Build the mock hou module once per test module."""
+    mock = MagicMock()
+    
+    # Mock hipFile operations
+    mock.hipFile.load = MagicMock()
+    mock.hipFile.save = MagicMock()
+    mock.hipFile.path = MagicMock(return_value="/some/path.hiplc")
+    
+    # Constants import_usds compares parm template types against
+    mock.parmTemplateType.String = 0
+    
+    # Mock other operations
+    mock.hscript = MagicMock()
+    mock.expandString = MagicMock(return_value="/tmp")
+    mock.hda.installFile = MagicMock()
+    mock.hda.definitionsInFile = MagicMock(return_value=[MagicMock(nodeTypeName=MagicMock(return_value="test_hda"))])
+    
+    return mock
+
+
 @pytest.fixture
-def mock_hou():
-    """Mock the hou module completely."""
-    with patch('pipeline.hip_manager.hou') as mock:
-        # Mock hipFile operations
-        mock.hipFile.load = MagicMock()
-        mock.hipFile.save = MagicMock()
-        mock.hipFile.path = MagicMock(return_value="/some/path.hiplc")
-        
-        # Mock node operations
-        mock_obj_node = MagicMock()
-        mock_geo_node = MagicMock()
-        mock_sop_node = MagicMock()
-        
-        # Setup node hierarchy
-        mock_obj_node.createNode.return_value = mock_geo_node
-        mock_geo_node.createNode.return_value = mock_sop_node
-        mock_geo_node.node.return_value = None  # No default file1 node
-        mock_sop_node.parms.return_value = [MagicMock(name='file', parmTemplate=MagicMock(type=MagicMock(return_value=0)))]
-        
-        mock.node.return_value = mock_obj_node
-        
-        # Mock other operations
-        mock.hscript = MagicMock()
-        mock.expandString = MagicMock(return_value="/tmp")
-        mock.hda.installFile = MagicMock()
-        mock.hda.definitionsInFile = MagicMock(return_value=[MagicMock(nodeTypeName=MagicMock(return_value="test_hda"))])
-        
-        yield mock
+def mock_hou(monkeypatch, shared_hou):
+    """Mock the hou module completely, with its calls cleared and a fresh /obj node."""
+    shared_hou.reset_mock()
+    shared_hou.node.return_value = FakeNode("obj")
+    monkeypatch.setattr(hm, 'hou', shared_hou)
+    return shared_hou
+
+
+# Originals plus one modified_ copy, which both prefix extraction and import skip
+USD_FILES_BASIC = (
+    "/path/to/chair_base.usd",
+    "/path/to/desk_A3DCZYC5E6B3MT80.usd",
+    "/path/to/lamp_B000BRBYJ8.usd",
+    "/path/to/modified_chair_base.usd",
+)
+
+
+# Based on actual extraction logic: desk -> "desk", lamp_B000BRBYJ8 -> "B000BRBYJ8"
+_EXPECTED_PREFIXES_BASIC = frozenset({"chair", "desk", "B000BRBYJ8"})
+_EXPECTED_PREFIXES_DUPLICATES = frozenset({"chair", "desk"})
+
+
+@pytest.fixture(scope="module")
+def usd_files_basic():
+    """USD_FILES_BASIC shared by the tests that feed it to the hip manager."""
+    return USD_FILES_BASIC
+
+
+# One file-object double for every test that writes the USD mapping
+_MOCK_OPEN = mock_open()
+
+
+@pytest.fixture
+def fake_open(monkeypatch):
+    """Route builtins.open to the shared mock_open, with its calls cleared."""
+    _MOCK_OPEN.reset_mock()
+    monkeypatch.setattr('builtins.open', _MOCK_OPEN)
+    return _MOCK_OPEN
+
+
+@pytest.fixture(scope="module")
+def hip():
+    """HoudiniHipManager holds no state, so one instance serves every test."""
+    return hm.HoudiniHipManager()
+
+
+def usd_imports(obj):
+    """The usdimport SOPs import_usds created inside its geo container."""
+    container, = obj.children
+    return [node for node in container.children if node.typeName() == "usdimport"]
+
+
+def fake_rename(calls):
+    """Stand-in for rename_usd_primitives that records each original path."""
+    def _rename(orig, base_id):
+        calls.append(orig)
+        return f"/path/to/modified_{os.path.basename(orig)}"
+    return _rename
 
 
 def test_hip_manager_creation():
@@ -48,99 +171,75 @@ def test_hip_manager_creation():
     assert hip is not None
 
 
-@patch('os.path.isfile')
-def test_load_hip_file(mock_isfile, mock_hou):
+def test_load_hip_file(monkeypatch, mock_hou, hip):
     """Test loading a HIP file."""
-    mock_isfile.return_value = True  # Mock file exists
-    hip = hm.HoudiniHipManager()
+    monkeypatch.setattr('os.path.isfile', lambda path: True)  # Mock file exists
     hip.load("/path/to/file.hiplc")
     mock_hou.hipFile.load.assert_called_once_with("/path/to/file.hiplc")
 
 
-def test_load_hip_file_not_found():
+def test_load_hip_file_not_found(hip):
     """Test loading a non-existent HIP file."""
-    hip = hm.HoudiniHipManager()
     with pytest.raises(FileNotFoundError):
         hip.load("/nonexistent/file.hiplc")
 
 
-def test_save_hip_file(mock_hou):
+def test_save_hip_file(mock_hou, hip):
     """Test saving a HIP file."""
-    hip = hm.HoudiniHipManager()
-    
     # Test saving with a path
     hip.save("/path/to/file.hiplc")
     mock_hou.hipFile.save.assert_called_once_with("/path/to/file.hiplc")
 
 
-def test_save_hip_file_no_path(mock_hou):
+def test_save_hip_file_no_path(mock_hou, hip):
     """Test saving a HIP file without specifying a path."""
-    hip = hm.HoudiniHipManager()
-    
     # Test saving without a path
     hip.save()
     mock_hou.hipFile.save.assert_called_once_with()
 
 
-@patch('os.path.exists')
-def test_save_hip_file_unique_name(mock_exists, mock_hou):
+def test_save_hip_file_unique_name(monkeypatch, mock_hou, hip):
     """Test saving with unique filename generation."""
     # Mock file existence to trigger unique name generation
-    mock_exists.side_effect = lambda path: path == "/path/to/file.hiplc"
+    monkeypatch.setattr('os.path.exists', frozenset({"/path/to/file.hiplc"}).__contains__)
     
-    hip = hm.HoudiniHipManager()
     hip.save("/path/to/file.hiplc")
     
     # Should call save with the unique filename
     mock_hou.hipFile.save.assert_called_once_with("/path/to/file_001.hiplc")
 
 
-def test_extract_base_identifier_from_filename():
-    """Test the base identifier extraction function."""
-    # Test various filename patterns based on actual behavior
-    test_cases = [
-        ("nan_A3DCZYC5E6B3MT80.usd", "A3DCZYC5E6B3MT80"),
-        ("B000BRBYJ8_A3DCQGU4ZVZ7XB5H_base.usd", "B000BRBYJ8"),
-        ("Mesh_B0009VXBAQ.usd", "B0009VXBAQ"),
-        ("chair_base.usd", "chair"),  # Uses first part for non-ID patterns
-        ("desk_A3DCZYC5E6B3MT80.usd", "desk"),  # Uses first part since it doesn't start with B/A
-        ("lamp_B000BRBYJ8.usd", "B000BRBYJ8"),  # B prefix recognized
-    ]
-    
-    for filename, expected in test_cases:
-        result = hm.extract_base_identifier_from_filename(filename)
-        assert result == expected, f"Expected {expected}, got {result} for {filename}"
+# Various filename patterns based on actual behavior
+@pytest.mark.parametrize("filename,expected", [
+    ("nan_A3DCZYC5E6B3MT80.usd", "A3DCZYC5E6B3MT80"),
+    ("B000BRBYJ8_A3DCQGU4ZVZ7XB5H_base.usd", "B000BRBYJ8"),
+    ("Mesh_B0009VXBAQ.usd", "B0009VXBAQ"),
+    ("chair_base.usd", "chair"),  # Uses first part for non-ID patterns
+    ("desk_A3DCZYC5E6B3MT80.usd", "desk"),  # Uses first part since it doesn't start with B/A
+    ("lamp_B000BRBYJ8.usd", "B000BRBYJ8"),  # B prefix recognized
+])
+def test_extract_base_identifier_from_filename(filename, expected):
+    """Test the base identifier extraction function (one case per test, so pytest -n auto can spread them)."""
+    result = hm.extract_base_identifier_from_filename(filename)
+    assert result == expected, f"Expected {expected}, got {result} for {filename}"
 
 
-def test_get_material_prefixes_from_usds():
+def test_get_material_prefixes_from_usds(hip, usd_files_basic):
     """Test material prefix extraction from USD filenames."""
-    hip = hm.HoudiniHipManager()
-    
-    usd_files = [
-        "/path/to/chair_base.usd",
-        "/path/to/desk_A3DCZYC5E6B3MT80.usd", 
-        "/path/to/lamp_B000BRBYJ8.usd",
-        "/path/to/modified_chair_base.usd"  # Should be filtered out
-    ]
-    
-    prefixes = hip.get_material_prefixes_from_usds(usd_files)
+    prefixes = hip.get_material_prefixes_from_usds(usd_files_basic)
     
-    # Based on actual extraction logic: desk -> "desk", lamp_B000BRBYJ8 -> "B000BRBYJ8"
-    expected = ["chair", "desk", "B000BRBYJ8"]
-    assert set(prefixes) == set(expected)
+    assert frozenset(prefixes) == _EXPECTED_PREFIXES_BASIC
+    assert len(prefixes) == len(_EXPECTED_PREFIXES_BASIC)
 
 
-def test_get_material_prefixes_empty_list():
+def test_get_material_prefixes_empty_list(hip):
     """Test material prefix extraction with empty list."""
-    hip = hm.HoudiniHipManager()
     prefixes = hip.get_material_prefixes_from_usds([])
     assert prefixes == []
 
 
-def test_get_material_prefixes_with_duplicates():
+def test_get_material_prefixes_with_duplicates(hip):
     """Test material prefix extraction with duplicate names."""
-    hip = hm.HoudiniHipManager()
-    
     usd_files = [
         "/path/to/chair_base.usd",
         "/another/path/chair_base.usd",  # Duplicate
@@ -150,138 +249,78 @@ def test_get_material_prefixes_with_duplicates():
     prefixes = hip.get_material_prefixes_from_usds(usd_files)
     
     # Should contain unique prefixes only - based on actual extraction
-    expected = ["chair", "desk"]
-    assert set(prefixes) == set(expected)
-    assert len(prefixes) == 2  # No duplicates
+    assert frozenset(prefixes) == _EXPECTED_PREFIXES_DUPLICATES
+    assert len(prefixes) == len(_EXPECTED_PREFIXES_DUPLICATES)  # No duplicates
 
 
-@patch('os.path.isfile')
-@patch('os.path.exists')
-@patch('builtins.open', new_callable=mock_open)
-@patch('json.dump')
-@patch('tempfile.gettempdir', return_value='/tmp')
-def test_import_usds_success(mock_tempdir, mock_json_dump, mock_file, mock_exists, mock_isfile, mock_hou):
+def test_import_usds_success(monkeypatch, mock_hou, fake_open, hip):
     """Test successful USD import."""
     # Setup mocks
-    mock_isfile.return_value = True
-    mock_exists.return_value = False  # No existing modified files
-    
-    # Set up the hou.parmTemplateType.String constant FIRST
-    mock_hou.parmTemplateType.String = 0
-    
-    # Mock the Houdini parameter finding - fix the parameter name check
-    mock_param = MagicMock()
-    mock_param.name.return_value = "file"  # This should match the "file" in parm.name().lower()
-    mock_param.parmTemplate.return_value.type.return_value = 0  # Use the same value as String
-    mock_param.set = MagicMock()  # Add the set method
-    
-    mock_sop_node = MagicMock()
-    mock_sop_node.parms.return_value = [mock_param]
-    mock_sop_node.type.return_value.name.return_value = "usdimport"
-    
-    mock_geo_node = MagicMock()
-    mock_geo_node.createNode.return_value = mock_sop_node
-    mock_geo_node.node.return_value = None  # No default file1 node
-    
-    mock_obj_node = MagicMock()
-    mock_obj_node.createNode.return_value = mock_geo_node
-    
-    mock_hou.node.return_value = mock_obj_node
+    renamed = []
+    monkeypatch.setattr('os.path.isfile', lambda path: True)
+    monkeypatch.setattr('os.path.exists', lambda path: False)  # No existing modified files
+    monkeypatch.setattr('json.dump', lambda *args, **kwargs: None)
+    monkeypatch.setattr(hm, 'rename_usd_primitives', fake_rename(renamed))
     
     # Create test files
     usd_files = ["/path/to/chair_base.usd", "/path/to/desk_A3DCZYC5E6B3MT80.usd"]
     
-    hip = hm.HoudiniHipManager()
+    hip.import_usds(usd_files)
     
-    # Mock the USD processing functions
-    with patch.object(hm, 'rename_usd_primitives') as mock_rename:
-        mock_rename.side_effect = lambda orig, base_id: f"/path/to/modified_{os.path.basename(orig)}"
-        
-        hip.import_usds(usd_files)
-        
-        # Verify USD processing was called
-        assert mock_rename.call_count == 2
-        
-        # Verify nodes were created
-        assert mock_hou.node.called
-        assert mock_obj_node.createNode.called
-        
-        # Verify parameter was set
-        assert mock_param.set.call_count == 2
+    # Verify USD processing was called
+    assert len(renamed) == 2
+    
+    # Verify nodes were created
+    mock_hou.node.assert_called_once_with("/obj")
+    imports = usd_imports(mock_hou.node.return_value)
+    
+    # Verify each import's file parameter was set to its modified USD
+    assert [node.parm("filepath1").values for node in imports] == [
+        ["/path/to/modified_chair_base.usd"],
+        ["/path/to/modified_desk_A3DCZYC5E6B3MT80.usd"],
+    ]
 
 
-def test_import_usds_missing_file():
+def test_import_usds_missing_file(caplog, hip):
     """Test import_usds with missing file."""
-    hip = hm.HoudiniHipManager()
-    
-    # This should not raise an exception, but should print a warning
+    # This should not raise an exception, but should log a warning
     # and skip the missing file
-    with patch('builtins.print') as mock_print:
+    with caplog.at_level("WARNING", logger=hm.__name__):
         hip.import_usds(["does_not_exist.usd"])
         
-        # Should have printed a warning
-        mock_print.assert_any_call("Warning: USD file not found: does_not_exist.usd. Skipping.")
+        # Should have logged a warning
+        assert "USD file not found: does_not_exist.usd. Skipping." in caplog.messages
 
 
-@patch('tempfile.gettempdir', return_value='/tmp')
-def test_import_usds_filters_modified_files(mock_tempdir, mock_hou):
+def test_import_usds_filters_modified_files(monkeypatch, mock_hou, fake_open, caplog, hip, usd_files_basic):
     """Test that import_usds filters out modified files from input."""
-    hip = hm.HoudiniHipManager()
+    renamed = []
+    monkeypatch.setattr('os.path.isfile', lambda path: True)
+    monkeypatch.setattr('json.dump', lambda *args, **kwargs: None)
+    monkeypatch.setattr(hm, 'rename_usd_primitives', fake_rename(renamed))
     
-    usd_files = [
-        "/path/to/chair_base.usd",
-        "/path/to/modified_chair_base.usd",  # Should be filtered out
-        "/path/to/desk_A3DCZYC5E6B3MT80.usd"
-    ]
+    with caplog.at_level("INFO", logger=hm.__name__):
+        hip.import_usds(usd_files_basic)
+    
+    # Should log that it's skipping the modified file
+    assert "Skipping modified USD file from input: modified_chair_base.usd" in caplog.messages
     
-    with patch('builtins.print') as mock_print:
-        with patch('os.path.isfile', return_value=True):
-            with patch.object(hm, 'rename_usd_primitives') as mock_rename:
-                with patch('builtins.open', mock_open()):
-                    with patch('json.dump'):
-                        mock_rename.side_effect = lambda orig, base_id: f"/path/to/modified_{os.path.basename(orig)}"
-                        
-                        # Mock Houdini nodes to prevent the RuntimeError
-                        mock_param = MagicMock()
-                        mock_param.name.return_value = "file"  
-                        mock_param.parmTemplate.return_value.type.return_value = 0  # String type
-                        mock_param.set = MagicMock()  # Add set method
-                        
-                        mock_sop = MagicMock()
-                        mock_sop.parms.return_value = [mock_param]
-                        mock_sop.type.return_value.name.return_value = "usdimport"
-                        
-                        mock_geo = MagicMock()
-                        mock_geo.createNode.return_value = mock_sop
-                        mock_geo.node.return_value = None  # No default file1
-                        
-                        mock_obj = MagicMock() 
-                        mock_obj.createNode.return_value = mock_geo
-                        
-                        mock_hou.node.return_value = mock_obj
-                        mock_hou.parmTemplateType.String = 0
-                        
-                        hip.import_usds(usd_files)
-                        
-                        # Should print that it's skipping the modified file
-                        mock_print.assert_any_call("Skipping modified USD file from input: modified_chair_base.usd")
-                        
-                        # Should only process 2 files, not 3
-                        assert mock_rename.call_count == 2
-
-
-@patch('os.path.exists')
-def test_create_unique_hip_filename(mock_exists):
+    # Should only process the 3 originals, not the modified copy
+    assert renamed == list(USD_FILES_BASIC[:3])
+    assert len(usd_imports(mock_hou.node.return_value)) == 3
+
+
+def test_create_unique_hip_filename(monkeypatch):
     """Test unique HIP filename generation."""
     # Mock file existence
-    mock_exists.side_effect = lambda path: path in ["/path/to/file.hiplc", "/path/to/file_001.hiplc"]
+    monkeypatch.setattr('os.path.exists', frozenset({"/path/to/file.hiplc", "/path/to/file_001.hiplc"}).__contains__)
     
     result = hm._create_unique_hip_filename("/path/to/file.hiplc")
     assert result == "/path/to/file_002.hiplc"
 
 
-def test_create_unique_hip_filename_no_conflict():
+def test_create_unique_hip_filename_no_conflict(monkeypatch):
     """Test unique HIP filename when no conflict exists."""
-    with patch('os.path.exists', return_value=False):
-        result = hm._create_unique_hip_filename("/path/to/file.hiplc")
-        assert result == "/path/to/file.hiplc"
\ No newline at end of file
+    monkeypatch.setattr('os.path.exists', lambda path: False)
+    result = hm._create_unique_hip_filename("/path/to/file.hiplc")
+    assert result == "/path/to/file.hiplc"
\ No newline at end of file
@@ -0,0 +1,275 @@
+# tests/test_job_submitter.py
+
+import pytest
+import ast
+import io
+import os
+import time
+import asyncio
+import gc
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from pipeline import job_submitter as js
+
+
+@pytest.fixture
+def submitter(tmp_path):
+    """A DeadlineSubmitter pointed at a dummy deadlinecommand file."""
+    fake_cmd = tmp_path / "deadlinecommand"
+    fake_cmd.touch()
+    return js.DeadlineSubmitter(deadline_command=str(fake_cmd))
+
+
+def test_submitter_missing_command():
+    """Test that a missing deadlinecommand raises FileNotFoundError."""
+    with patch('shutil.which', return_value=None):
+        with pytest.raises(FileNotFoundError):
+            js.DeadlineSubmitter(deadline_command="/nonexistent/deadlinecommand")
+
+
+def _fake_popen(out, returncode=0, err=b"", seen=None):
+    """Build a subprocess.Popen replacement that writes stderr and serves stdout lines."""
+    def popen(cmd, stdout=None, stderr=None, **kwargs):
+        if seen is not None:
+            seen['cmd'] = cmd
+            with open(cmd[1]) as f:
+                seen['job_info'] = f.read()
+        stderr.write(err)
+        return MagicMock(stdout=io.StringIO(out), wait=MagicMock(return_value=returncode))
+    return popen
+
+
+def test_submit_simulation(submitter, monkeypatch):
+    """Test that a simulation job is submitted and temp files are cleaned up."""
+    monkeypatch.delattr(os, "posix_spawn", raising=False)
+    seen = {}
+
+    with patch('subprocess.Popen', side_effect=_fake_popen("Submitting...\nJobID=abc123\n", seen=seen)):
+        result = submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+    js.DeadlineSubmitter._join_reapers()
+
+    assert result == "abc123"
+    assert seen['cmd'][0] == submitter.deadline_command
+    assert "Name=Sim_scene.hiplc" in seen['job_info']
+    assert "Frames=1-10" in seen['job_info']
+    assert not os.path.exists(seen['cmd'][1])
+    assert not os.path.exists(seen['cmd'][2])
+
+
+def test_submit_failure_raises(submitter, monkeypatch):
+    """Test that a non-zero exit code raises DeadlineSubmissionError."""
+    monkeypatch.delattr(os, "posix_spawn", raising=False)
+    with patch('subprocess.Popen', side_effect=_fake_popen("", returncode=1, err=b"bad job\n")):
+        with pytest.raises(js.DeadlineSubmissionError, match="bad job"):
+            submitter.submit_render("/path/to/scene.hiplc", "1-10", "render", depends_on="abc123")
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_spawn"), reason="os.posix_spawn not available")
+def test_submit_posix_spawn(tmp_path):
+    """Test the posix_spawn path captures stdout and the exit code of deadlinecommand."""
+    fake_cmd = tmp_path / "deadlinecommand"
+    fake_cmd.write_text('#!/bin/sh\necho "$JOB_LINE"\necho "oops" >&2\nexit $EXIT_CODE\n')
+    fake_cmd.chmod(0o755)
+    submitter = js.DeadlineSubmitter(deadline_command=str(fake_cmd))
+
+    with patch.dict(os.environ, {"JOB_LINE": "JobID=abc123", "EXIT_CODE": "0"}):
+        assert submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache") == "abc123"
+
+    with patch.dict(os.environ, {"JOB_LINE": "no job", "EXIT_CODE": "3"}):
+        with pytest.raises(js.DeadlineSubmissionError, match="oops"):
+            submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_spawn"), reason="os.posix_spawn not available")
+def test_submit_returns_before_exit(tmp_path):
+    """Test that the JobID is returned while deadlinecommand is still logging."""
+    fake_cmd = tmp_path / "deadlinecommand"
+    fake_cmd.write_text('#!/bin/sh\necho "JobID=abc123"\nsleep 2\necho "done"\n')
+    fake_cmd.chmod(0o755)
+    submitter = js.DeadlineSubmitter(deadline_command=str(fake_cmd))
+
+    start = time.monotonic()
+    assert submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache") == "abc123"
+    assert time.monotonic() - start < 1.5
+
+    js.DeadlineSubmitter._join_reapers()
+    assert not js.DeadlineSubmitter._reapers
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_spawn"), reason="os.posix_spawn not available")
+def test_submit_logs_failed_exit_after_job_id(tmp_path, caplog):
+    """Test that a non-zero exit after the JobID is logged with stderr instead of lost."""
+    fake_cmd = tmp_path / "deadlinecommand"
+    fake_cmd.write_text('#!/bin/sh\necho "JobID=abc123"\necho "late failure" >&2\nexit 2\n')
+    fake_cmd.chmod(0o755)
+    submitter = js.DeadlineSubmitter(deadline_command=str(fake_cmd))
+
+    with caplog.at_level("WARNING", logger="pipeline.job_submitter"):
+        assert submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache") == "abc123"
+        js.DeadlineSubmitter._join_reapers()
+
+    assert "exited with code 2" in caplog.text
+    assert "late failure" in caplog.text
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_spawn"), reason="os.posix_spawn not available")
+def test_join_reapers_gives_up_after_timeout(tmp_path):
+    """Test that a hung deadlinecommand cannot block interpreter exit."""
+    fake_cmd = tmp_path / "deadlinecommand"
+    fake_cmd.write_text('#!/bin/sh\necho "JobID=abc123"\nsleep 5\n')
+    fake_cmd.chmod(0o755)
+    submitter = js.DeadlineSubmitter(deadline_command=str(fake_cmd))
+    submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+
+    start = time.monotonic()
+    js.DeadlineSubmitter._join_reapers(timeout=0.2)
+    assert time.monotonic() - start < 1.0
+
+
+def test_submit_simulation_async(submitter):
+    """Test that the asyncio submission path awaits deadlinecommand."""
+    proc = MagicMock(returncode=0)
+    proc.communicate = AsyncMock(return_value=(b"JobID=abc123\n", b""))
+
+    with patch('asyncio.create_subprocess_exec', new=AsyncMock(return_value=proc)) as mock_exec:
+        result = asyncio.run(submitter.submit_simulation_async("/path/to/scene.hiplc", "1-10", "simcache"))
+
+    assert result == "abc123"
+    args = mock_exec.call_args[0]
+    assert args[0] == submitter.deadline_command
+    assert not os.path.exists(args[1])
+
+
+def test_submit_async_failure_raises(submitter):
+    """Test that the asyncio submission path raises on a non-zero exit code."""
+    proc = MagicMock(returncode=1)
+    proc.communicate = AsyncMock(return_value=(b"", b"bad job\n"))
+
+    with patch('asyncio.create_subprocess_exec', new=AsyncMock(return_value=proc)):
+        with pytest.raises(js.DeadlineSubmissionError, match="bad job"):
+            asyncio.run(submitter.get_tops_status_async("/path/to/scene.hiplc", "/obj/assets/wrapped_assets"))
+
+
+def _plugin_script(pi):
+    """Return the HoudiniPythonScript value from plugin info lines."""
+    key = b"HoudiniPythonScript="
+    return next(line for line in pi if line.startswith(key))[len(key):].decode()
+
+
+def _unwrap_script(script):
+    """Return the source inside a rendered one-line exec(...) script."""
+    call = ast.parse(script, mode="eval").body
+    assert isinstance(call, ast.Call) and call.func.id == "exec"
+    return ast.literal_eval(call.args[0])
+
+
+def test_tops_script_escapes_paths(submitter):
+    """Test that HIP and HDA paths with quotes/backslashes are embedded as valid literals."""
+    hip_path = r"E:\Project's\scene.hiplc"
+    hda_path = "/obj/assets/wrapped_assets"
+
+    ji, pi = submitter._tops_with_scheduler_job(hip_path, hda_path, scheduler_type="localscheduler")
+    source = _unwrap_script(_plugin_script(pi))
+
+    assert f"hou.hipFile.load({hip_path!r})" in source
+    assert f"hou.node({hda_path!r})" in source
+    assert "'/tasks/topnet1/localscheduler'" in source
+
+
+@pytest.mark.parametrize("build", ["_tops_workflow_job", "_tops_with_scheduler_job", "_tops_status_job"])
+def test_tops_scripts_compile(submitter, build):
+    """Test that every injected TOPs script is one line of valid Python, even for awkward paths."""
+    ji, pi = getattr(submitter, build)(r"E:\Project's\scene.hiplc", '/obj/"assets"/wrapped_assets')
+    script = _plugin_script(pi)
+
+    assert "\n" not in script
+    compile(script, "<HoudiniPythonScript>", "exec")
+    compile(_unwrap_script(script), "<HoudiniPythonScript>", "exec")
+
+
+def _fake_persistent_command(tmp_path, on_submit):
+    """Write a fake `deadlinecommand -Persistent` that runs on_submit (shell) per SubmitJob and answers Echo."""
+    fake_cmd = tmp_path / "deadlinecommand"
+    fake_cmd.write_text(
+        '#!/bin/sh\n'
+        'n=0\n'
+        'while read cmd && read arg; do\n'
+        '  case "$cmd" in\n'
+        f'    SubmitJob) read pi; n=$((n+1)); {on_submit} ;;\n'
+        '    Echo) echo "$arg" ;;\n'
+        '  esac\n'
+        'done\n'
+    )
+    fake_cmd.chmod(0o755)
+    return str(fake_cmd)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs a POSIX shell")
+def test_submit_persistent_reuses_process(tmp_path):
+    """Test that persistent mode sends every submission to one deadlinecommand process."""
+    fake_cmd = _fake_persistent_command(
+        tmp_path, 'echo "Submitting $arg"; echo "JobID=job$n-$$"; echo "Trailing log for job$n"'
+    )
+    submitter = js.DeadlineSubmitter(deadline_command=fake_cmd, persistent=True)
+
+    try:
+        first = submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+        second = submitter.submit_render("/path/to/scene.hiplc", "1-10", "render", depends_on=first)
+    finally:
+        submitter.close()
+
+    assert first.startswith("job1-")
+    assert second.startswith("job2-")
+    assert first.split("-")[1] == second.split("-")[1]
+    assert submitter._proc is None
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs a POSIX shell")
+def test_submit_persistent_reply_without_job_id_raises(tmp_path):
+    """Test that a reply with no JobID fails that submission without desyncing the next one."""
+    fake_cmd = _fake_persistent_command(
+        tmp_path, 'if [ $n -eq 1 ]; then echo "Submission rejected"; else echo "JobID=job$n"; fi'
+    )
+    submitter = js.DeadlineSubmitter(deadline_command=fake_cmd, persistent=True)
+
+    try:
+        with pytest.raises(js.DeadlineSubmissionError, match="Submission rejected"):
+            submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+        assert submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache") == "job2"
+    finally:
+        submitter.close()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs a POSIX shell")
+def test_submit_persistent_times_out_and_resets(tmp_path):
+    """Test that a hung persistent process is killed instead of blocking every later submission."""
+    fake_cmd = _fake_persistent_command(tmp_path, 'sleep 30')
+    submitter = js.DeadlineSubmitter(deadline_command=fake_cmd, persistent=True, persistent_timeout=0.5)
+
+    try:
+        start = time.monotonic()
+        with pytest.raises(js.DeadlineSubmissionError, match="No reply"):
+            submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+        assert time.monotonic() - start < 5
+        assert submitter._proc is None
+    finally:
+        submitter.close()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs a POSIX shell")
+def test_submit_persistent_stopped_when_submitter_is_collected(tmp_path):
+    """Test that restarts don't keep the submitter alive and collecting it stops the process."""
+    fake_cmd = _fake_persistent_command(tmp_path, 'echo "JobID=job$n"')
+    submitter = js.DeadlineSubmitter(deadline_command=fake_cmd, persistent=True)
+
+    submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+    first = submitter._proc
+    with submitter._proc_lock:
+        submitter._reset_persistent()
+    submitter.submit_simulation("/path/to/scene.hiplc", "1-10", "simcache")
+    second = submitter._proc
+    assert first.poll() is not None
+
+    del submitter
+    gc.collect()
+    assert second.poll() is not None
@@ -2,35 +2,54 @@
 
 import pytest
 import os
-from unittest.mock import patch, MagicMock
+import importlib
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
-def test_hou_module_import():
-    """Test that hou module can be imported."""
+
+@pytest.fixture(scope="session")
+def hou_mod():
+    """Import hou once per session and cache its attribute names, skipping when it is unavailable."""
+    hou = pytest.importorskip("hou", reason="hou module not available - check Houdini installation")
+    return SimpleNamespace(mod=hou, attrs=frozenset(dir(hou)))
+
+
+# Core pipeline modules every session needs, imported once by pipeline_mods
+_PIPELINE_MODULES = ('config', 'asset_locator', 'hip_manager', 'submit_config_generator')
+
+
+@pytest.fixture(scope="session")
+def pipeline_mods():
+    """Import the core pipeline modules once per session, keyed by short name."""
     try:
-        import hou
-        print("✓ hou module imported successfully")
-        
-        # Check if we're in a full Houdini session
-        if hasattr(hou, 'hipFile'):
-            try:
-                current_file = hou.hipFile.path()
-                print(f"Current HIP file: {current_file}")
-            except:
-                print("hipFile.path() failed - might be in batch mode")
-        else:
-            print("Running in limited Houdini environment (hython without full session)")
-            
+        return {name: importlib.import_module(f"pipeline.{name}") for name in _PIPELINE_MODULES}
     except ImportError as e:
-        pytest.fail(f"Could not import hou module: {e}")
+        pytest.fail(f"Could not import required pipeline modules: {e}")
 
 
-def test_hip_file_loading():
+def test_hou_module_import(hou_mod):
+    """Test that hou module can be imported."""
+    hou = hou_mod.mod
+    print("✓ hou module imported successfully")
+    
+    # Check if we're in a full Houdini session
+    if 'hipFile' in hou_mod.attrs:
+        try:
+            current_file = hou.hipFile.path()
+            print(f"Current HIP file: {current_file}")
+        except:
+            print("hipFile.path() failed - might be in batch mode")
+    else:
+        print("Running in limited Houdini environment (hython without full session)")
+
+
+def test_hip_file_loading(hou_mod):
     """Test HIP file operations if available."""
     try:
-        import hou
+        hou = hou_mod.mod
         
         # Check if hipFile is available (full Houdini session)
-        if hasattr(hou, 'hipFile'):
+        if 'hipFile' in hou_mod.attrs:
             try:
                 print("Current file:", hou.hipFile.path())
                 
@@ -51,53 +70,44 @@ def test_hip_file_loading():
         pytest.fail(f"Unexpected error during HIP file operations: {e}")
 
 
-@patch('hou.hipFile')
-def test_hip_file_operations_mocked(mock_hip_file):
-    """Test HIP file operations with mocked hou module."""
-    import hou
-    
-    # Configure the mock
+@pytest.fixture
+def mocked_hipfile(monkeypatch, hou_mod):
+    """Replace hou.hipFile with a MagicMock whose path() is /mock/path.hiplc."""
+    mock_hip_file = MagicMock()
     mock_hip_file.path.return_value = "/mock/path.hiplc"
-    mock_hip_file.load = MagicMock()
-    mock_hip_file.save = MagicMock()
-    mock_hip_file.clear = MagicMock()
+    monkeypatch.setattr(hou_mod.mod, 'hipFile', mock_hip_file)
+    return mock_hip_file
+
+
+def test_hip_file_operations_mocked(mocked_hipfile, hou_mod):
+    """Test HIP file operations with mocked hou module."""
+    hou = hou_mod.mod
     
     # Test operations
     current_path = hou.hipFile.path()
     assert current_path == "/mock/path.hiplc"
     
     hou.hipFile.clear()
-    mock_hip_file.clear.assert_called_once()
+    mocked_hipfile.clear.assert_called_once()
     
     hou.hipFile.load("/test/path.hiplc")
-    mock_hip_file.load.assert_called_once_with("/test/path.hiplc")
+    mocked_hipfile.load.assert_called_once_with("/test/path.hiplc")
 
 
-def test_pipeline_imports():
+def test_pipeline_imports(pipeline_mods):
     """Test that our pipeline modules can be imported."""
-    try:
-        from pipeline import config
-        from pipeline import asset_locator
-        from pipeline import hip_manager
-        from pipeline import submit_config_generator
-        
-        print("✓ All core pipeline modules imported successfully")
-        
-        # Test optional imports
-        try:
-            from pipeline import solaris_material_manager
-            print("✓ Solaris material manager imported")
-        except ImportError as e:
-            print(f"Warning: Could not import solaris_material_manager: {e}")
-            
-    except ImportError as e:
-        pytest.fail(f"Could not import required pipeline modules: {e}")
+    assert all(pipeline_mods[name] is not None for name in _PIPELINE_MODULES)
+    print("✓ All core pipeline modules imported successfully")
+
 
+def test_optional_pipeline_imports():
+    """Test the optional Solaris material manager import, skipping when it is unavailable."""
+    pytest.importorskip("pipeline.solaris_material_manager")
+    print("✓ Solaris material manager imported")
 
-def test_houdini_environment():
+
+def test_houdini_environment(hou_mod):
     """Test the Houdini environment setup."""
-    import os
-    
     # Check if HFS is set
     hfs = os.getenv('HFS')
     if hfs:
@@ -105,43 +115,34 @@ def test_houdini_environment():
     else:
         print("⚠ Warning: HFS environment variable not set")
     
-    # Try to import hou
+    hou = hou_mod.mod
+    print("✓ hou module available")
+    
+    # Check what's available in this hou session
+    available_attrs = [attr for attr in hou_mod.attrs if not attr.startswith('_')]
+    print(f"Available hou attributes: {len(available_attrs)}")
+    
+    # Key attributes we need for our pipeline
+    key_attrs = ['hipFile', 'node', 'hscript', 'Vector3', 'Matrix4', 'hda']
+    
+    for attr in key_attrs:
+        status = "✓" if attr in hou_mod.attrs else "✗"
+        print(f"  {status} hou.{attr}")
+    
+    # Check session type
     try:
-        import hou
-        print("✓ hou module available")
-        
-        # Check what's available in this hou session
-        available_attrs = [attr for attr in dir(hou) if not attr.startswith('_')]
-        print(f"Available hou attributes: {len(available_attrs)}")
-        
-        # Key attributes we need for our pipeline
-        key_attrs = ['hipFile', 'node', 'hscript', 'Vector3', 'Matrix4', 'hda']
-        missing_attrs = []
+        is_ui = hou.isUIAvailable() if 'isUIAvailable' in hou_mod.attrs else False
+        session_type = "GUI" if is_ui else "Batch/Command-line"
+        print(f"✓ Session type: {session_type}")
+    except:
+        print("? Session type: Unknown")
         
-        for attr in key_attrs:
-            has_attr = hasattr(hou, attr)
-            status = "✓" if has_attr else "✗"
-            print(f"  {status} hou.{attr}")
-            if not has_attr:
-                missing_attrs.append(attr)
-        
-        # Check session type
-        try:
-            is_ui = hou.isUIAvailable() if hasattr(hou, 'isUIAvailable') else False
-            session_type = "GUI" if is_ui else "Batch/Command-line"
-            print(f"✓ Session type: {session_type}")
-        except:
-            print("? Session type: Unknown")
-            
-        # For pipeline functionality, we mainly need node, hscript, and hda
-        critical_attrs = ['node', 'hscript', 'hda']
-        missing_critical = [attr for attr in critical_attrs if not hasattr(hou, attr)]
-        
-        if missing_critical:
-            pytest.fail(f"Critical hou attributes missing: {missing_critical}")
-            
-    except ImportError:
-        pytest.fail("hou module not available - check Houdini installation")
+    # For pipeline functionality, we mainly need node, hscript, and hda
+    critical_attrs = ['node', 'hscript', 'hda']
+    missing_critical = [attr for attr in critical_attrs if attr not in hou_mod.attrs]
+    
+    if missing_critical:
+        pytest.fail(f"Critical hou attributes missing: {missing_critical}")
 
 
 def test_config_loading():
@@ -182,7 +183,12 @@ def test_asset_locator_functionality():
         pytest.fail(f"Asset locator test failed: {e}")
 
 
-def test_hip_manager_functionality():
+@pytest.mark.parametrize("filename", [
+    "chair_base.usd",
+    "desk_A3DCZYC5E6B3MT80.usd",
+    "nan_B000BRBYJ8.usd",
+])
+def test_hip_manager_functionality(hou_mod, filename):
     """Test hip manager basic functionality."""
     try:
         from pipeline.hip_manager import HoudiniHipManager, extract_base_identifier_from_filename
@@ -191,16 +197,9 @@ def test_hip_manager_functionality():
         print("✓ Hip manager created")
         
         # Test filename parsing
-        test_files = [
-            "chair_base.usd",
-            "desk_A3DCZYC5E6B3MT80.usd",
-            "nan_B000BRBYJ8.usd"
-        ]
-        
-        for filename in test_files:
-            base_id = extract_base_identifier_from_filename(filename)
-            print(f"  {filename} -> {base_id}")
-            assert base_id, f"Failed to extract base ID from {filename}"
+        base_id = extract_base_identifier_from_filename(filename)
+        print(f"  {filename} -> {base_id}")
+        assert base_id, f"Failed to extract base ID from {filename}"
             
         print("✓ Filename parsing works")
         
@@ -211,72 +210,58 @@ def test_hip_manager_functionality():
 def test_submit_config_generator():
     """Test submit config generator functionality."""
     try:
-        from pipeline.submit_config_generator import create_submit_config_script, get_default_submit_config_path
+        from pipeline.submit_config_generator import render_submit_config_script, get_default_submit_config_path
         
         # Test getting default path
         default_path = get_default_submit_config_path()
         assert default_path.endswith("submit_config.py"), f"Unexpected default path: {default_path}"
         print(f"✓ Default submit config path: {default_path}")
         
-        # Test script creation (with a temporary file)
-        import tempfile
-        import os
+        # Test script rendering in memory; create_submit_config_script only writes this out
+        content = render_submit_config_script(
+            hip_file_path="/test/path.hiplc",
+            scheduler_type="localscheduler"
+        )
+        print("✓ Submit config script created successfully")
         
-        # Create a temporary file manually to avoid Windows permission issues
-        temp_dir = tempfile.gettempdir()
-        temp_file = os.path.join(temp_dir, f"test_submit_config_{os.getpid()}.py")
+        # Verify the script has content
+        assert "load_and_execute_tops" in content, "Script missing main function"
+        assert "/test/path.hiplc" in content, "HIP file path not in script"
+        assert "localscheduler" in content, "Scheduler type not in script"
+        compile(content, "submit_config.py", "exec")
         
-        try:
-            create_submit_config_script(
-                hip_file_path="/test/path.hiplc",
-                scheduler_type="localscheduler",
-                output_path=temp_file
-            )
-            print("✓ Submit config script created successfully")
-            
-            # Verify the file was created and has content
-            with open(temp_file, 'r') as f:
-                content = f.read()
-                assert "load_and_execute_tops" in content, "Script missing main function"
-                assert "/test/path.hiplc" in content, "HIP file path not in script"
-                assert "localscheduler" in content, "Scheduler type not in script"
-                
-            print("✓ Submit config script content validated")
-            
-        finally:
-            # Clean up - use try/except to handle Windows permission issues
-            try:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-            except (PermissionError, OSError):
-                # On Windows, sometimes files are locked briefly
-                import time
-                time.sleep(0.1)
-                try:
-                    os.unlink(temp_file)
-                except (PermissionError, OSError):
-                    pass  # Give up if we still can't delete it
+        print("✓ Submit config script content validated")
                     
     except Exception as e:
         pytest.fail(f"Submit config generator test failed: {e}")
 
 
-def test_complete_pipeline_integration():
+@pytest.mark.parametrize("function_name", ["find_output_top", "report_when_cooked"])
+def test_submit_config_copies_match_execute_tops(function_name):
+    """Test that the startup script's copies of the rnd/execute_tops.py helpers have not drifted."""
+    import ast
+    from pipeline.submit_config_generator import render_submit_config_script
+
+    path = os.path.join(os.path.dirname(__file__), "..", "rnd", "execute_tops.py")
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    function = next(node for node in ast.parse(source).body
+                    if isinstance(node, ast.FunctionDef) and node.name == function_name)
+
+    content = render_submit_config_script(hip_file_path="/test/path.hiplc", scheduler_type="deadline")
+    assert ast.get_source_segment(source, function) in content
+
+
+def test_complete_pipeline_integration(hou_mod, pipeline_mods):
     """Test that all pipeline components can work together."""
     try:
-        # Import all required modules
-        from pipeline.config import settings
-        from pipeline.asset_locator import FilesystemLocator
-        from pipeline.hip_manager import HoudiniHipManager
-        from pipeline.submit_config_generator import get_default_submit_config_path
-        
         # Test basic integration
-        locator = FilesystemLocator()
-        hip_manager = HoudiniHipManager()
-        config_path = get_default_submit_config_path()
+        locator = pipeline_mods['asset_locator'].FilesystemLocator()
+        hip_manager = pipeline_mods['hip_manager'].HoudiniHipManager()
+        config_path = pipeline_mods['submit_config_generator'].get_default_submit_config_path()
         
         print("✓ All pipeline components integrated successfully")
-        print(f"  Config assets dir: {settings.assets_dir}")
+        print(f"  Config assets dir: {pipeline_mods['config'].settings.assets_dir}")
         print(f"  Default submit config: {config_path}")
         
     except Exception as e:
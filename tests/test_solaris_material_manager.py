@@ -0,0 +1,451 @@
+# tests/test_solaris_material_manager.py
+
+import pytest
+import os
+import json
+from unittest.mock import patch, MagicMock
+
+# Import the module under test
+from pipeline import solaris_material_manager as smm
+
+
+@pytest.fixture
+def assets_dir(tmp_path):
+    """An assets folder with a full texture set for one id and a partial set for another."""
+    for name in [
+        "nan_A3DCZYC5E6B3MT80_texture_diff.png",
+        "nan_A3DCZYC5E6B3MT80_texture_MR.png",
+        "nan_A3DCZYC5E6B3MT80_texture_normal.png",
+        "B000H7BCJ4_texture_diff.png",
+        "B000H7BCJ4_notes.txt",
+    ]:
+        (tmp_path / name).touch()
+    smm._ASSETS_LISTING_CACHE.clear()
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def texture_index_dir(tmp_path_factory, monkeypatch):
+    """Keep saved texture indexes out of the real cache directory."""
+    index_dir = tmp_path_factory.mktemp("texture_index")
+    monkeypatch.setattr(smm, "TEXTURE_INDEX_DIR", str(index_dir))
+    return index_dir
+
+
+def test_find_texture_files(assets_dir):
+    """Test that textures are matched by base id and suffix."""
+    textures = smm.find_texture_files(str(assets_dir), "A3DCZYC5E6B3MT80")
+
+    assert textures['diffuse'] == os.path.join(str(assets_dir), "nan_A3DCZYC5E6B3MT80_texture_diff.png")
+    assert textures['mr'] == os.path.join(str(assets_dir), "nan_A3DCZYC5E6B3MT80_texture_MR.png")
+    assert textures['normal'] == os.path.join(str(assets_dir), "nan_A3DCZYC5E6B3MT80_texture_normal.png")
+
+    partial = smm.find_texture_files(str(assets_dir), "B000H7BCJ4")
+    assert partial['diffuse'].endswith("B000H7BCJ4_texture_diff.png")
+    assert partial['mr'] is None and partial['normal'] is None
+
+
+def test_scan_assets_lists_directory_once(assets_dir):
+    """Test that repeated lookups reuse one directory listing."""
+    with patch('pipeline.solaris_material_manager.os.scandir', wraps=os.scandir) as mock_scandir:
+        files = smm._scan_assets(str(assets_dir))
+        for base_id in ["A3DCZYC5E6B3MT80", "B000H7BCJ4", "missing"]:
+            smm.find_texture_files(str(assets_dir), base_id)
+
+    assert mock_scandir.call_count == 1
+    assert files['diffuse']["B000H7BCJ4"] == "B000H7BCJ4_texture_diff.png"
+
+
+def test_build_texture_index_keys_by_base_id(assets_dir):
+    """Test that the texture index maps each kind's base ids to file names and skips everything else."""
+    (assets_dir / "folder_texture_diff.png").mkdir()
+    index = smm.build_texture_index(str(assets_dir))
+
+    assert index['diffuse'] == {
+        "B000H7BCJ4": "B000H7BCJ4_texture_diff.png",
+        "A3DCZYC5E6B3MT80": "nan_A3DCZYC5E6B3MT80_texture_diff.png",
+    }
+    assert index['mr'] == {"A3DCZYC5E6B3MT80": "nan_A3DCZYC5E6B3MT80_texture_MR.png"}
+    assert index['normal'] == {"A3DCZYC5E6B3MT80": "nan_A3DCZYC5E6B3MT80_texture_normal.png"}
+
+
+def test_find_texture_files_substring_fallback(assets_dir):
+    """Test that a base id that is only part of a texture's id still finds it."""
+    textures = smm.find_texture_files(str(assets_dir), "A3DCZYC5")
+    assert textures['diffuse'].endswith("nan_A3DCZYC5E6B3MT80_texture_diff.png")
+
+
+def test_scan_assets_missing_directory(tmp_path):
+    """Test that a missing assets folder yields no textures instead of raising."""
+    missing = str(tmp_path / "missing")
+    assert smm._scan_assets(missing) == {'diffuse': {}, 'mr': {}, 'normal': {}}
+    assert smm.find_texture_files(missing, "A3DCZYC5E6B3MT80") == {'diffuse': None, 'mr': None, 'normal': None}
+
+
+def _mock_node(type_name, parm_names):
+    """A node mock whose parm() only resolves the given parameter names."""
+    node = MagicMock()
+    node.type.return_value.name.return_value = type_name
+    parms = {name: MagicMock() for name in parm_names}
+    node.parm.side_effect = parms.get
+    node.parms.return_value = [MagicMock(**{'name.return_value': name}) for name in parm_names]
+    return node, parms
+
+
+def test_set_file_parameter_memoizes_parm_name():
+    """Test that the resolved file parameter is remembered per node type."""
+    smm._FILE_PARM_BY_TYPE.pop("customimage", None)
+    first, first_parms = _mock_node("customimage", ["signature", "tex0"])
+    assert smm.set_file_parameter(first, "/tex/a.png")
+    first_parms["tex0"].set.assert_called_once_with("/tex/a.png")
+    assert smm._FILE_PARM_BY_TYPE["customimage"] == "tex0"
+
+    second, second_parms = _mock_node("customimage", ["signature", "tex0"])
+    assert smm.set_file_parameter(second, "/tex/b.png")
+    second_parms["tex0"].set.assert_called_once_with("/tex/b.png")
+    second.parms.assert_not_called()
+
+
+def test_set_file_parameter_mtlximage():
+    """Test that mtlximage nodes go straight to their 'file' parameter."""
+    node, parms = _mock_node("mtlximage", ["file", "filename"])
+    assert smm.set_file_parameter(node, "/tex/a.png")
+    parms["file"].set.assert_called_once_with("/tex/a.png")
+    parms["filename"].set.assert_not_called()
+
+
+def test_connect_vop_nodes_caches_input_index():
+    """Test that input labels and names are read once per node type."""
+    smm._INPUT_TABLE_BY_TYPE.clear()
+    dest = MagicMock()
+    dest.type.return_value.name.return_value = "mtlxstandard_surface"
+    dest.inputLabels.return_value = ["Base", "Base Color", "Diffuse Roughness", "Metalness"]
+    dest.inputNames.return_value = ["base", "base_color", "diffuse_roughness", "metalness"]
+    src = MagicMock()
+
+    assert smm.connect_vop_nodes(dest, "base_color", src)
+    assert smm.connect_vop_nodes(dest, "Metalness", src, 2)
+    assert smm.connect_vop_nodes(dest, "base_color", src)
+
+    dest.setInput.assert_any_call(1, src, 0)
+    dest.setInput.assert_any_call(3, src, 2)
+    dest.inputLabels.assert_called_once()
+    dest.inputNames.assert_called_once()
+
+
+def test_connect_vop_nodes_falls_back_to_known_index():
+    """Test that unknown labels/names fall back to the standard surface indices."""
+    smm._INPUT_TABLE_BY_TYPE.clear()
+    dest = MagicMock()
+    dest.type.return_value.name.return_value = "mtlxstandard_surface"
+    dest.inputLabels.return_value = []
+    dest.inputNames.return_value = []
+    src = MagicMock()
+
+    assert smm.connect_vop_nodes(dest, "normal", src)
+    dest.setInput.assert_called_once_with(40, src, 0)
+    assert not smm.connect_vop_nodes(dest, "does_not_exist", src)
+
+
+def test_batched_network_edits_restores_update_mode():
+    """Test that the update mode is switched to manual and restored, even on error."""
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou:
+        mock_hou.updateModeSetting.return_value = "auto"
+
+        with pytest.raises(RuntimeError):
+            with smm.batched_network_edits():
+                mock_hou.setUpdateMode.assert_called_once_with(mock_hou.updateMode.Manual)
+                raise RuntimeError("build failed")
+
+        mock_hou.setUpdateMode.assert_called_with("auto")
+        mock_hou.undos.disabler.assert_called_once()
+
+
+def test_safe_set_parms_batches():
+    """Test that several parameters are set in a single setParms call."""
+    node = MagicMock()
+    smm.safe_set_parms(node, {"parmname": "surface", "parmtype": "surface"})
+    node.setParms.assert_called_once_with({"parmname": "surface", "parmtype": "surface"})
+    node.parm.assert_not_called()
+
+
+def test_safe_set_parms_reports_missing_parm():
+    """Test that a failed batch falls back to per-parm sets with a clear error."""
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou:
+        mock_hou.OperationFailed = type("OperationFailed", (Exception,), {})
+        node = MagicMock()
+        node.setParms.side_effect = mock_hou.OperationFailed("bad parm")
+        node.parm.side_effect = {"parmname": MagicMock()}.get
+
+        with pytest.raises(AttributeError, match="parmtype"):
+            smm.safe_set_parms(node, {"parmname": "surface", "parmtype": "surface"})
+
+    with pytest.raises(ValueError):
+        smm.safe_set_parms(None, {"parmname": "surface"})
+
+
+def test_node_type_has_parm_probes_once_per_type():
+    """Test that parameter existence is probed once per node type."""
+    smm._PARM_EXISTS.clear()
+    first, _ = _mock_node("mtlxstandard_surface", ["specular_roughness"])
+    second, _ = _mock_node("mtlxstandard_surface", ["specular_roughness"])
+
+    assert smm.node_type_has_parm(first, "specular_roughness")
+    assert not smm.node_type_has_parm(first, "roughness")
+    assert smm.node_type_has_parm(second, "specular_roughness")
+    assert not smm.node_type_has_parm(second, "roughness")
+
+    second.parm.assert_not_called()
+
+
+def test_connect_vop_nodes_reports_invalid_input():
+    """Test that a rejected connection is reported instead of raised."""
+    smm._INPUT_TABLE_BY_TYPE.clear()
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou:
+        mock_hou.OperationFailed = type("OperationFailed", (Exception,), {})
+        mock_hou.InvalidInput = type("InvalidInput", (Exception,), {})
+        dest = MagicMock()
+        dest.type.return_value.name.return_value = "mtlxstandard_surface"
+        dest.inputLabels.return_value = ["Base", "Base Color"]
+        dest.inputNames.return_value = ["base", "base_color"]
+        dest.setInput.side_effect = mock_hou.InvalidInput("bad input")
+
+        assert not smm.connect_vop_nodes(dest, "base_color", MagicMock())
+
+
+def test_create_solaris_mtlx_shader_clones_same_texture_layout(assets_dir):
+    """Test that a material with the same texture layout is cloned from the first one built."""
+    (assets_dir / "B000BRBYJ8_texture_diff.png").touch()
+    files = smm.build_texture_index(str(assets_dir))
+    material_library = MagicMock()
+    prototypes = {}
+
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou:
+        clone = MagicMock()
+        clone_nodes = {"diff_B000H7BCJ4": MagicMock(), "B000H7BCJ4": MagicMock()}
+        # A renamed node is found under its new name
+        clone_nodes["diff_B000BRBYJ8"] = clone_nodes["diff_B000H7BCJ4"]
+        clone.node.side_effect = clone_nodes.get
+        mock_hou.copyNodesTo.return_value = [clone]
+
+        first = smm.create_solaris_mtlx_shader(material_library, "B000H7BCJ4_base", str(assets_dir),
+                                               {}, files, prototypes)
+        second = smm.create_solaris_mtlx_shader(material_library, "B000BRBYJ8_base", str(assets_dir),
+                                                {}, files, prototypes)
+
+    assert prototypes[(True, False, False)] == (first, "B000H7BCJ4")
+    mock_hou.copyNodesTo.assert_called_once_with([first], material_library)
+    assert second is clone
+    clone.setName.assert_called_once_with("B000BRBYJ8_base_material")
+    # Only the nodes named after the base id are renamed, so Surface_Out is left alone
+    clone_nodes["diff_B000H7BCJ4"].setName.assert_called_once_with("diff_B000BRBYJ8")
+    clone_nodes["B000H7BCJ4"].setName.assert_called_once_with("B000BRBYJ8")
+    clone.children.assert_not_called()
+    clone.node.assert_any_call("diff_B000BRBYJ8")
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("nan_A3DCZYC5E6B3MT80_texture_MR", "A3DCZYC5E6B3MT80"),
+    ("B000H7BCJ4_A3DCJVRR51BY4X0U_base", "B000H7BCJ4"),
+    ("chair_base", "chair"),
+    ("desk_A3DCZYC5E6B3MT80", "desk"),
+    ("office_chair_ABCDEFGHIJ", "office_chair"),
+    ("office_chair_wheels", "office_chair_wheels"),
+])
+def test_extract_base_identifier(prefix, expected):
+    """Test base identifier extraction from material prefixes."""
+    assert smm.extract_base_identifier(prefix) == expected
+
+
+def test_set_file_parameter_single_lookup_for_known_type():
+    """Test that a known node type costs exactly one parm lookup."""
+    node, parms = _mock_node("mtlximage", ["file"])
+    assert smm.set_file_parameter(node, "/tex/a.png")
+    node.parm.assert_called_once_with("file")
+    parms["file"].set.assert_called_once_with("/tex/a.png")
+
+
+def test_clear_lop_network_children_batches_delete():
+    """Test that children are removed in one deleteItems call, falling back per node."""
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou:
+        mock_hou.OperationFailed = type("OperationFailed", (Exception,), {})
+        children = (MagicMock(), MagicMock())
+        network = MagicMock(**{'children.return_value': children})
+
+        smm.clear_lop_network_children(network)
+        network.deleteItems.assert_called_once_with(children)
+        children[0].destroy.assert_not_called()
+
+        network.deleteItems.side_effect = mock_hou.OperationFailed("locked")
+        smm.clear_lop_network_children(network)
+        children[0].destroy.assert_called_once()
+        children[1].destroy.assert_called_once()
+
+
+def test_safe_set_parms_tuple_fallback():
+    """Test that tuple values fall back to parmTuple().set when the batch fails."""
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou:
+        mock_hou.OperationFailed = type("OperationFailed", (Exception,), {})
+        node = MagicMock()
+        node.setParms.side_effect = mock_hou.OperationFailed("bad parm")
+
+        smm.safe_set_parms(node, {"t": (-1.0, 0.3, 1.0)})
+        node.parmTuple.assert_called_once_with("t")
+        node.parmTuple.return_value.set.assert_called_once_with((-1.0, 0.3, 1.0))
+
+
+@pytest.mark.parametrize("snippet", [smm._MATERIAL_ASSIGN_VEX, smm._PLASTIC_ASSIGN_VEX])
+def test_assign_vex_printf_guarded_by_debug(snippet):
+    """Test that the assignment VEX only logs when the debug toggle is on."""
+    assert 'chi("debug_materials")' in snippet
+    lines = snippet.splitlines()
+    for i, line in enumerate(lines):
+        if "printf(" in line and "if(debug)" not in line:
+            # Unguarded printfs must sit inside an enclosing if(debug) block
+            assert any(l.strip() == "if(debug) {" for l in lines[:i]), line
+
+
+@pytest.mark.parametrize("primpath, name_attr, expected", [
+    ("/assets/B000BRBYJ8/geo/B000BRBYJ8", "", "B000BRBYJ8"),
+    ("/assets/Mesh_A3DCZYC5E6B3MT80_1", "", "A3DCZYC5E6B3MT80"),
+    ("/assets/B000H7BCJ4/polySurface12", "", "B000H7BCJ4"),
+    ("/assets/polySurface12", "", None),
+    ("/assets/base/geo", "", None),
+    # The name attribute is checked before the path
+    ("/assets/base/geo", "B000H7BCJ4", "B000H7BCJ4"),
+    ("/assets/B000BRBYJ8/geo", "Mesh_A3DCZYC5E6B3MT80_2", "A3DCZYC5E6B3MT80"),
+    # The prim name wins over the attribute and its ancestors
+    ("/assets/B000H7BCJ4/B000BRBYJ8", "B000H7BCJ5", "B000BRBYJ8"),
+    # Nested ids in the path resolve to the shallowest one
+    ("/assets/B000BRBYJ8/Mesh_A3DCZYC5E6B3MT80_1/polySurface3", "", "B000BRBYJ8"),
+])
+def test_assign_vex_id_regex(primpath, name_attr, expected):
+    """Test the base id lookup order used by the assignment VEX."""
+    import re
+    pattern = re.search(r'string id_regex = "([^"]+)";', smm._MATERIAL_ASSIGN_VEX).group(1)
+    found = None
+    # Same sources, in the same order, as the VEX loop: prim name, name attribute, path
+    for source in (primpath.rsplit("/", 1)[-1], name_attr, primpath):
+        match = re.search(pattern, source)
+        found = next((g for g in match.groups() if g), None) if match else None
+        if found:
+            break
+    assert found == expected
+
+
+def test_create_plastic_material_sets_known_parms_directly():
+    """Test that plastic properties are set in one call without probing parm names."""
+    library = MagicMock()
+    std_surface = library.createNode.return_value.createNode.return_value
+
+    smm.create_plastic_material(library)
+
+    std_surface.setParms.assert_called_with({"specular_roughness": 0.05, "transmission": 1.0})
+    std_surface.parm.assert_not_called()
+
+
+def test_create_plastic_material_rediscovers_parms_on_failure():
+    """Test that rejected parm names fall back to discovery and the result is cached."""
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou, \
+         patch.object(smm, "_PLASTIC_PARMS", {"specular_roughness": 0.05, "transmission": 1.0}):
+        mock_hou.OperationFailed = type("OperationFailed", (Exception,), {})
+        smm._PARM_EXISTS.clear()
+        library = MagicMock()
+        std_surface, _ = _mock_node("mtlxstandard_surface", ["roughness", "transmission_weight"])
+        library.createNode.return_value.createNode.side_effect = [MagicMock(), std_surface]
+        std_surface.setParms.side_effect = [mock_hou.OperationFailed("bad parm"), None]
+
+        smm.create_plastic_material(library)
+
+        std_surface.setParms.assert_called_with({"roughness": 0.05, "transmission_weight": 1.0})
+        assert smm._PLASTIC_PARMS == {"roughness": 0.05, "transmission_weight": 1.0}
+    smm._PARM_EXISTS.clear()
+
+
+def test_create_plastic_material_keeps_parms_when_retry_fails():
+    """Test that a failed retry leaves the known plastic parm names untouched."""
+    known = {"specular_roughness": 0.05, "transmission": 1.0}
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou, \
+         patch.object(smm, "_PLASTIC_PARMS", dict(known)):
+        mock_hou.OperationFailed = type("OperationFailed", (Exception,), {})
+        smm._PARM_EXISTS.clear()
+        library = MagicMock()
+        std_surface, parms = _mock_node("mtlxstandard_surface", ["roughness", "transmission_weight"])
+        library.createNode.return_value.createNode.side_effect = [MagicMock(), std_surface]
+        std_surface.setParms.side_effect = mock_hou.OperationFailed("bad parm")
+        parms["transmission_weight"].set.side_effect = mock_hou.OperationFailed("locked parm")
+
+        smm.create_plastic_material(library)
+
+        assert smm._PLASTIC_PARMS == known
+    smm._PARM_EXISTS.clear()
+
+
+def test_unique_prefixes_keeps_first_per_base_id():
+    """Test that prefixes sharing a base identifier are collapsed in order."""
+    prefixes = ["nan_B000BRBYJ8_base", "A3DCZYC5E6B3MT80", " nan_B000BRBYJ8 ", "B000BRBYJ8"]
+
+    assert smm.unique_prefixes(prefixes) == ["nan_B000BRBYJ8_base", "A3DCZYC5E6B3MT80"]
+
+
+def test_get_or_create_lopnet_finds_or_creates_network():
+    """Test that an existing LOP network is reused and a missing one is created."""
+    with patch('pipeline.solaris_material_manager.hou') as mock_hou:
+        obj_node = mock_hou.node.return_value
+        lop_net = MagicMock()
+        obj_node.node.return_value = lop_net
+        assert smm.get_or_create_lopnet("styrofoam_material_pipeline") == (lop_net, False)
+        obj_node.createNode.assert_not_called()
+
+        obj_node.node.return_value = None
+        created = smm.get_or_create_lopnet("styrofoam_material_pipeline")
+        assert created == (obj_node.createNode.return_value, True)
+        obj_node.createNode.assert_called_once_with("lopnet", "styrofoam_material_pipeline")
+
+
+def test_scan_assets_reuses_saved_index(assets_dir):
+    """Test that a fresh session loads the saved index instead of rescanning."""
+    before = sorted(os.listdir(assets_dir))
+    first = smm._scan_assets(str(assets_dir))
+    assert sorted(os.listdir(assets_dir)) == before  # Nothing written into the asset tree
+    assert os.path.isfile(smm._texture_index_path(str(assets_dir)))
+
+    smm._ASSETS_LISTING_CACHE.clear()
+    with patch('os.scandir', side_effect=AssertionError("rescanned")):
+        assert smm._scan_assets(str(assets_dir)) == first
+
+    # Adding a texture changes the directory mtime and invalidates the saved index
+    smm._ASSETS_LISTING_CACHE.clear()
+    (assets_dir / "B000BRBYJ8_texture_diff.png").touch()
+    assert "B000BRBYJ8" in smm._scan_assets(str(assets_dir))['diffuse']
+
+
+def test_material_prim_pattern_matches_vex_id_rules():
+    """Test the Assign Material pattern covers the id forms the assignment VEX accepts."""
+    pattern = smm.material_prim_pattern("B000BRBYJ8")
+
+    assert pattern.startswith("%type:Mesh & (")
+    for name in ("B000BRBYJ8", "Mesh_B000BRBYJ8", "Mesh_B000BRBYJ8_*"):
+        assert f"/**/{name} " in pattern + " "
+        assert f"/**/{name}/**" in pattern
+
+
+@pytest.mark.parametrize("saved", [
+    [],
+    {"mtime_ns": 0, "index": []},
+    {"index": {"diffuse": [], "mr": {}, "normal": {}}},
+    {"index": {"diffuse": {"A": 1}, "mr": {}, "normal": {}}},
+    {"index": {"diffuse": {}, "mr": {}}},
+])
+def test_scan_assets_rescans_malformed_saved_index(assets_dir, saved):
+    """Test that a malformed saved index is ignored and the directory rescanned."""
+    mtime = os.stat(assets_dir).st_mtime_ns
+    if isinstance(saved, dict):
+        saved = {"assets_dir": os.path.abspath(assets_dir), "mtime_ns": mtime, **saved}
+    os.makedirs(smm.TEXTURE_INDEX_DIR, exist_ok=True)
+    with open(smm._texture_index_path(str(assets_dir)), "w") as f:
+        json.dump(saved, f)
+
+    index = smm._scan_assets(str(assets_dir))
+    assert index == smm.build_texture_index(str(assets_dir))
+    assert smm.find_texture_files(str(assets_dir), "A3DCZYC5E6B3MT80")['diffuse'].endswith("_texture_diff.png")